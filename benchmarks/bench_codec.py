@@ -0,0 +1,97 @@
+"""
+Decode and encode times, and decode peak memory, of each installed json
+codec of spec_utils.codec with synthetic payloads shaped like the nettime
+elements, nettime cube and visma payroll responses. Best of several runs.
+
+Usage: python benchmarks/bench_codec.py
+"""
+
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spec_utils import codec
+
+
+def get_payloads(seed: int = 1):
+    """ Return {name: payload} of the synthetic responses. """
+
+    rnd = random.Random(seed)
+
+    elements = {"total": 5000, "items": [{
+        "id": i,
+        "nif": str(10 ** 7 + i),
+        "Apellidos_Nombre": f"Apellido {i}, Nombre",
+        "Departments": [{"id": i % 50, "name": f"Dep {i % 50}"}],
+        "Calendar": {"id": 1, "name": "General"},
+        **{f"Field{k}": rnd.random() for k in range(15)}
+    } for i in range(5000)]}
+
+    cube = {"dataRows": [[
+        i % 3000,
+        f"2020-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        i % 7,
+        rnd.randint(0, 600),
+        rnd.random()
+    ] for i in range(200000)]}
+
+    payroll = {"pageNumber": 1, "totalPages": 50, "values": [{
+        "EmployeeExternalId": str(i),
+        "Lines": [{
+            "Concept": f"C{j}",
+            "Amount": round(rnd.uniform(0, 1e5), 2),
+            "Units": j,
+            "Description": "Sueldo básico"
+        } for j in range(40)]
+    } for i in range(1000)]}
+
+    return {'elements': elements, 'cube': cube, 'payroll': payroll}
+
+
+def best(func, *args, runs: int = 5):
+    """ Best time of runs calls to func(*args), in seconds. """
+
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def main():
+    print(f"codecs: {', '.join(codec.available())}")
+
+    for name, payload in get_payloads().items():
+        codec.use('json')
+        raw = codec.dumps(payload)
+        print(f"{name} {len(raw) / 1e6:.1f}MB")
+
+        for codec_name in codec.available():
+            codec.use(codec_name)
+            assert codec.loads(raw) == payload
+
+            loads = best(codec.loads, raw)
+            dumps = best(codec.dumps, payload)
+
+            tracemalloc.start()
+            codec.loads(raw)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            print(
+                f"  {codec_name:7} loads {loads * 1e3:7.1f}ms "
+                f"dumps {dumps * 1e3:7.1f}ms peak {peak / 1e6:6.1f}MB"
+            )
+
+    # back to the fastest codec
+    codec.use()
+
+
+if __name__ == '__main__':
+    main()
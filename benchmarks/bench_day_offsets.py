@@ -0,0 +1,102 @@
+"""
+Day offset conversions of nettime6.Client -get_days_offset() and
+get_days_from_offsets()- against the previous per-day loops. Best of
+several runs for one year and for 200 years of days.
+
+Usage: python benchmarks/bench_day_offsets.py
+"""
+
+import os
+import sys
+import time
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from stub_server import serve
+from spec_utils import nettime6 as nt6
+
+
+def loop_days_offset(days: list, first_year: int):
+    """ Previous get_days_offset(), one day at a time. """
+
+    first_date = datetime.date(first_year, 1, 1)
+    days_numbers = []
+    for day in days:
+        if not isinstance(day, datetime.date):
+            day = datetime.date.fromisoformat(day)
+        days_numbers.append((day - first_date).days)
+
+    return days_numbers
+
+
+def loop_days_from_offsets(offsets: list, first_year: int):
+    """ Previous get_days_from_offsets(), one offset at a time. """
+
+    first_date = datetime.date(first_year, 1, 1)
+    return [
+        (first_date + datetime.timedelta(days=offset)).isoformat() \
+            for offset in offsets
+    ]
+
+
+def best(func, *args, runs: int = 7):
+    """ Best time of runs calls to func(*args), in seconds. """
+
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def compare(name: str, old, new, *args):
+    old_time, new_time = best(old, *args), best(new, *args)
+    print(f"  {name:24} {old_time * 1e6:10.0f}us -> {new_time * 1e6:8.0f}us")
+
+
+def main(port: int = 8766):
+    server = serve(port)
+
+    with nt6.Client(f'http://127.0.0.1:{port}', 'user', 'pwd') as client:
+        first_year = client.settings.get('firstDate')
+
+        for years in (1, 200):
+            dates = pd.date_range('2020-01-01', periods=365 * years)
+            str_days = [d.isoformat() for d in dates.date]
+            date_days = list(dates.date)
+            series = pd.Series(dates)
+            offsets = client.get_days_offset(date_days)
+
+            print(f"{len(dates)} days, old -> new")
+            compare(
+                'str list to offsets',
+                loop_days_offset, lambda d, _: client.get_days_offset(d),
+                str_days, first_year
+            )
+            compare(
+                'date list to offsets',
+                loop_days_offset, lambda d, _: client.get_days_offset(d),
+                date_days, first_year
+            )
+            compare(
+                'datetime Series',
+                lambda s, y: loop_days_offset(list(s.dt.date), y),
+                lambda s, _: client.get_days_offset(s),
+                series, first_year
+            )
+            compare(
+                'offsets to dates',
+                loop_days_from_offsets,
+                lambda o, _: client.get_days_from_offsets(o),
+                offsets, first_year
+            )
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
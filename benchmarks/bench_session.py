@@ -0,0 +1,48 @@
+"""
+Requests per second of nettime6.Client against the stub server, with a
+new connection per call -requests.get- and with the pooled session of the
+client.
+
+Usage: python benchmarks/bench_session.py [requests]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from stub_server import serve
+from spec_utils import nettime6 as nt6
+
+
+def main(n: int = 1000, port: int = 8765):
+    server = serve(port)
+    url = f'http://127.0.0.1:{port}'
+
+    with nt6.Client(url, 'user', 'pwd') as client:
+        # per-call requests, like before the pooled session
+        start = time.perf_counter()
+        for _ in range(n):
+            requests.get(
+                f'{url}/api/ping',
+                headers=client.headers,
+                timeout=10
+            ).json()
+        per_call = n / (time.perf_counter() - start)
+
+        # pooled session of the client
+        start = time.perf_counter()
+        for _ in range(n):
+            client.get('/api/ping')
+        pooled = n / (time.perf_counter() - start)
+
+    server.shutdown()
+    print(f"{n} GETs")
+    print(f"per-call requests.get: {per_call:6.0f} req/s")
+    print(f"pooled session:        {pooled:6.0f} req/s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,87 @@
+"""
+Minimal nettime server used by the benchmarks. Serves the login, logout,
+settings and ping endpoints over plain HTTP on localhost.
+
+Run it alone with `python benchmarks/stub_server.py [port]` or start it in
+a thread with serve().
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+import threading
+import json
+import sys
+
+# counters of the requests served
+STATS = {"requests": 0, "logins": 0}
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    # keep-alive, so clients can reuse the connections
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, obj, status: int = 200):
+        """ Send obj as json body with Content-Length. """
+
+        body = json.dumps(obj).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        STATS["requests"] += 1
+        path = urlparse(self.path).path
+
+        if path == "/api/settings":
+            return self.send_json({"rol": "Admin", "firstDate": 2000})
+
+        if path == "/api/ping":
+            return self.send_json({"ok": True})
+
+        self.send_json({"error": path}, 404)
+
+    def do_POST(self):
+        STATS["requests"] += 1
+        path = urlparse(self.path).path
+
+        # body is ignored, but must be read to reuse the connection
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        if path == "/api/login":
+            STATS["logins"] += 1
+            return self.send_json({
+                "ok": True,
+                "access_token": f"token{STATS['logins']}"
+            })
+
+        if path == "/api/logout":
+            return self.send_json({"ok": True})
+
+        self.send_json({"error": path}, 404)
+
+
+def serve(port: int = 8765):
+    """
+    Start the stub server in a daemon thread.
+
+    :param port: (int) Port of localhost.
+    :return: :class:`ThreadingHTTPServer` object
+    :rtype: ThreadingHTTPServer
+    """
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    print(f"Stub server on http://127.0.0.1:{port}")
+    ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
@@ -25,9 +25,16 @@ setup(
         'sqlalchemy'
     ],
 
-    extra_require={
+    extras_require={
         'dev': [
             'pytest>=3.8',
+            'pyflakes',
+        ],
+        'async': [
+            'httpx',
+        ],
+        'fast': [
+            'orjson',
         ],
     },
 
@@ -0,0 +1,113 @@
+import json
+
+# optional fast codecs, the first installed is used
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# orjson options compatible with the payloads of the clients
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY \
+    if orjson else 0
+
+# name of the codec in use, see use()
+name = None
+
+
+def available():
+    """ Return the names of the installed codecs, fastest first. """
+
+    codecs = []
+    if orjson:
+        codecs.append('orjson')
+    if ujson:
+        codecs.append('ujson')
+
+    return codecs + ['json']
+
+
+def use(codec: str = None):
+    """
+    Select the json codec used by all clients.
+
+    :param codec: (str) 'orjson', 'ujson' or 'json'. The fastest installed
+        codec if None.
+    :return: :class:`str` object with name of the codec in use.
+    :rtype: str
+    """
+
+    global name
+
+    codecs = available()
+    if codec is None:
+        codec = codecs[0]
+
+    if codec not in codecs:
+        raise ValueError(f"Codec json no disponible: '{codec}'.")
+
+    name = codec
+    return name
+
+
+def loads(data):
+    """
+    Decode a json document with the codec in use.
+
+    :param data: bytes or str with the json document.
+    :return: json object
+    :rtype: json
+    """
+
+    try:
+        if name == 'orjson':
+            return orjson.loads(data)
+
+        if name == 'ujson':
+            return ujson.loads(data)
+    except ValueError:
+        # stdlib accepts NaN and Infinity, the others don't
+        pass
+
+    return json.loads(data)
+
+
+def dumps(obj):
+    """
+    Encode obj as compact json with the codec in use.
+
+    :param obj: json serializable object.
+    :return: :class:`bytes` object
+    :rtype: bytes
+    """
+
+    try:
+        if name == 'orjson':
+            return orjson.dumps(obj, option=ORJSON_OPTIONS)
+
+        if name == 'ujson':
+            return ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+    except (TypeError, OverflowError):
+        # types of the stdlib encoder only, e.g. subclasses or big ints
+        pass
+
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def decode(response):
+    """
+    Return the json of a response -requests or httpx- with the codec in use.
+
+    :param response: Response with json content.
+    :return: json object
+    :rtype: json
+    """
+
+    return loads(response.content)
+
+
+use()
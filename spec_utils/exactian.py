@@ -1,7 +1,7 @@
 #from string import digits as str_digits, ascii_lowercase as str_letters
 from urllib.parse import urlparse, urlencode, urljoin
-from base64 import b64encode, b64decode
-import requests
+from base64 import b64encode
+from .transport import Transport
 
 class Client:
     def __init__(self, url: str, username: str, pwd: str, *args, **kwargs):
@@ -13,12 +13,20 @@ class Client:
             "Accept": "application/json",
             "Accept-Encoding": "gzip,deflate",
         }
+
+        # pooled session with precomputed headers and auth, see Transport
+        kwargs.setdefault("timeout", 10)
+        self.transport = Transport(
+            headers=self.headers,
+            auth=(self.username, pwd),
+            **kwargs
+        )
     
     def __enter__(self, *args, **kwargs):
         return self
 
     def __exit__(self, *args, **kwargs):
-        return 
+        return self.transport.close()
 
     def get(self, path: str, params: dict = None, **kwargs):
         """
@@ -32,27 +40,12 @@ class Client:
         :rtype: dict
         """
 
-        # query prepare
-        query = {
-            "url": urljoin(self.client_url.geturl(), path),
-            "params": params,
-            "headers": self.headers,
-            "timeout": kwargs.get("timeout", 10),
-            "auth": (self.username, b64decode(self.pwd).decode('utf-8'))
-        }
-
-        # consulting nettime
-        response = requests.get(**query)
-
-        # raise if was an error
-        if response.status_code not in range(200, 300):
-            raise ConnectionError(response.text)
-
-        # to json -> json
-        try:
-            return response.json()
-        except:
-            return {}
+        # request.get -> json
+        return self.transport.get(
+            url=urljoin(self.client_url.geturl(), path),
+            params=params,
+            timeout=kwargs.get("timeout", None)
+        )
 
     def get_employees(self, cuil: str = None, cuit: str = None, \
             business_type_opening: str = None, detail: bool = False, **kwargs):
@@ -1,5 +1,8 @@
 from urllib.parse import urlparse, urlencode
 from base64 import b64encode, b64decode
+from .transport import RetryPolicy, get_limiter
+from . import codec
+import threading
 import requests
 import datetime
 
@@ -12,11 +15,21 @@ class Client:
     def __init__(self, url: str, username: str, pwd: str, *args, **kwargs):
         """ Create a conection with nettime app using recived parameters. """
 
-        super().__init__(*args, **kwargs)
+        super().__init__()
         self.nettime_url = urlparse(url)
         self.username = username
         self.pwd = b64encode(pwd.encode('utf-8'))
 
+        # bounded retries of rejected requests, see RetryPolicy
+        retry = kwargs.get("retry", 3)
+        self.retry = retry if isinstance(retry, RetryPolicy) else \
+            RetryPolicy(attempts=retry or 1)
+        self._connect_lock = threading.RLock()
+        self._reconnecting = False
+
+        # adaptive concurrency limit of requests, see get_limiter()
+        self.limiter = get_limiter(kwargs.get("limiter", None), url)
+
         #connect client automatically
         self.connect()
 
@@ -47,10 +60,13 @@ class Client:
 
         return bool(self.headers) and bool(self.access_token)
     
-    def connect(self):
-        """ Connect the client to get access_token and headers values. """
+    def connect(self, force: bool = False):
+        """
+        Connect the client to get access_token and headers values. Use force
+        to login again with a connected client.
+        """
 
-        if self.is_connected:
+        if self.is_connected and not force:
             return
 
         url = f'{self.nettime_url.geturl()}/api/login'
@@ -63,7 +79,7 @@ class Client:
         if response.status_code != 200:
             raise ConnectionError(response.text)
 
-        json_data = response.json()
+        json_data = codec.decode(response)
 
         if not json_data.get("ok"):
             raise ConnectionError(json_data.get("message"))
@@ -72,14 +88,67 @@ class Client:
         self.headers = self.get_headers()
         self.user_rol = self.get_user_rol()
 
-    def reconnect(self):
-        """ Reconnect client cleaning headers and access_token. """
-
-        #clean token and headers for safety
-        self.access_token = None
-        self.headers = None
-
-        self.connect()
+    def reconnect(self, token: str = None):
+        """
+        Reconnect client replacing headers and access_token. If token is the
+        expired access_token and other thread has replaced it already, the
+        new one is used instead of login again.
+        """
+
+        with self._connect_lock:
+            # session rejected again while this thread reconnects
+            if self._reconnecting:
+                raise ConnectionError("Sesión rechazada luego de reconectar.")
+
+            # reconnected by other thread
+            if token and self.is_connected and self.access_token != token:
+                return
+
+            self._reconnecting = True
+            try:
+                self.connect(force=True)
+            finally:
+                self._reconnecting = False
+
+    def request(self, method: str, url: str, idempotent: bool = None, \
+            **kwargs):
+        """
+        Sends a request with the retry policy of the client. On 401 the
+        client is reconnected -once for all threads- and the request is sent
+        again with the new session.
+
+        :param method: Method for the new :class:`Request` object.
+        :param url: URL for the new :class:`Request` object.
+        :param idempotent: (bool) Override the idempotency rules of the
+            retry policy.
+        :param \*\*kwargs: Optional arguments that ``request`` takes.
+        :return: :class:`requests.Response` object
+        :rtype: requests.Response
+        """
+
+        # json body encoded with the codec in use
+        if kwargs.get("json") is not None:
+            kwargs["data"] = codec.dumps(kwargs.pop("json"))
+
+        token = None
+
+        def send():
+            nonlocal token
+
+            # session used by this attempt
+            token = self.access_token
+            if not self.limiter:
+                return requests.request(
+                    method, url, headers=self.headers, **kwargs)
+
+            return self.limiter.call(
+                requests.request, method, url, headers=self.headers, **kwargs)
+
+        return self.retry.call(
+            send, method, urlparse(url).path,
+            idempotent=idempotent,
+            on_unauthorized=lambda: self.reconnect(token)
+        )
 
     def get_headers(self):
         """ Return headers for a specific conection """
@@ -116,18 +185,13 @@ class Client:
             raise ConnectionError("El cliente esta desconectado.")
 
         url = f'{self.nettime_url.geturl()}/api/settings'
-        response = requests.get(url, headers=self.headers)
-
-        # if session was closed, reconect client and try again
-        if response.status_code == 401:
-            self.reconnect()
-            self.get_user_rol()
+        response = self.request('GET', url)
 
         # raise if was an error
         if response.status_code != 200:
             raise ConnectionError(response.text)
 
-        json_data = response.json()
+        json_data = codec.decode(response)
 
         return json_data.get('rol')
     
@@ -176,12 +240,7 @@ class Client:
             "idEmp": employee_id,
         }
 
-        response = requests.post(url, json=json_data, headers=self.headers)
-
-        # if session was closed, reconect client and try again
-        if response.status_code == 401:
-            self.reconnect()
-            self.add_clocking(employee_id, date, time)
+        response = self.request('POST', url, json=json_data)
 
         # raise if was an error
         if response.status_code != 200:
@@ -203,18 +262,13 @@ class Client:
         }
 
         lookup_url = f'{url}?{urlencode(data)}'
-        response = requests.get(lookup_url, headers=self.headers)
-
-        # if session was closed, reconect client and try again
-        if response.status_code == 401:
-            self.reconnect()
-            self.get_employee_id(dni)
+        response = self.request('GET', lookup_url)
 
         # raise if was an error
         if response.status_code != 200:
             raise ConnectionError(response.text)
         
-        json_data = response.json()
+        json_data = codec.decode(response)
 
         if not json_data.get("total"):
             raise ValueError("No se encuentra el DNI")
@@ -248,12 +302,7 @@ class Client:
             "mobileId": None,
         }
 
-        response = requests.post(url, json=json_data, headers=self.headers)
-
-        # if session was closed, reconect client and try again
-        if response.status_code == 401:
-            self.reconnect()
-            self.add_remote_clocking(timetype)
+        response = self.request('POST', url, json=json_data)
 
         # raise if was an error
         if response.status_code != 200:
@@ -302,12 +351,7 @@ class Client:
             "name": name,
         }
 
-        response = requests.post(url, json=json_data, headers=self.headers)
-
-        # if session was closed, reconect client and try again
-        if response.status_code == 401:
-            self.reconnect()
-            self.add_clocking(employee_id, date, time)
+        response = self.request('POST', url, json=json_data)
 
         # raise if was an error
         if response.status_code != 200:
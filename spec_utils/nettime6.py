@@ -2,12 +2,47 @@ from string import digits as str_digits, ascii_lowercase as str_letters
 from random import choice as r_choice
 from urllib.parse import urlparse, urlencode, urljoin
 from base64 import b64encode, b64decode
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from functools import lru_cache
+from .transport import Backoff, RetryPolicy, RateLimiter, TTLCache, \
+    SessionStore, bounded_map
+from . import transport, codec
+import pandas as pd
+import numpy as np
+import threading
+import hashlib
+import copy
+import csv
+import os
 import requests
 import datetime
+import asyncio
+import json
+import time
 import re
 
+# optional dependency of AsyncClient
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 __nettime__ = "6.0.1.17769"
 
+# pandas dtypes of nettime field types
+FIELD_DTYPES = {
+    "int": "Int64",
+    "long": "Int64",
+    "string": "string",
+    "bool": "boolean",
+    "boolean": "boolean",
+    "double": "float64",
+    "decimal": "float64",
+    "float": "float64",
+    "date": "datetime64[ns]",
+    "datetime": "datetime64[ns]",
+}
+
 def random_str(size=5, chars=str_digits + str_letters):
     """ Return a str of 'size' len with numbers and ascii lower letters. """
 
@@ -22,45 +57,376 @@ def create_random_suffix(name=""):
 
     return clean
 
+@lru_cache(maxsize=1024)
+def prepare_query(names: tuple, startDate: str, filterExp: str = ""):
+    """
+    Serialize a query to compact json str for use in url. Results are cached,
+    so repeated queries are serialized once.
+    """
+
+    query = {
+        "fields": [{"name": name, "startDate": startDate} for name in names]
+    }
+
+    if filterExp:
+        query["filterExp"] = filterExp
+
+    return json.dumps(query, separators=(',', ':'), ensure_ascii=False)
+
 class Query:
 
-    def __init__(self, fields: list, \
-            startDate: str = datetime.date.today().isoformat(), \
+    def __init__(self, fields: list, startDate: str = None, \
             filterExp: str = ""):
+        """
+        Fields and filter of a nettime container query.
+
+        :param fields: list of names of fields.
+        :param startDate: (str) Date of the values of fields. None -default-
+            uses the current date when the query is prepared.
+        :param filterExp: (str) Nettime compatible filter expression.
+        """
+
         self.queryfields = self.QueryFields(fields, startDate)
         self.filterExp = self.filter_prepare(expression=filterExp)
 
     def prepare(self):
         """ Format a query in str for use in url. """
 
-        query = '{}"fields":{}'.format('{', self.queryfields.prepare())
-
-        if self.filterExp:
-            query += f',"filterExp":"{self.filterExp}"'
-
-        query += '}'
-        return query
+        return prepare_query(
+            tuple(self.queryfields.names),
+            self.queryfields.get_start_date(),
+            self.filterExp
+        )
 
     def filter_prepare(self, expression: str = ""):
         return expression.replace('"', "'")
 
     class QueryFields:
-        def __init__(self, names: list, \
-                startDate: str = datetime.date.today().isoformat()):
+        def __init__(self, names: list, startDate: str = None):
             self.names = names
             self.startDate = startDate
 
+        def get_start_date(self):
+            """ Return startDate or the current date if is None. """
+
+            return self.startDate or datetime.date.today().isoformat()
+
         def prepare(self):
             """ Format a query in str for use in url. """
 
-            fields = []
-            for field in self.names:
-                fields.append({
-                    "name": field,
-                    "startDate": self.startDate
-                })
+            return json.dumps(
+                [{"name": name, "startDate": self.get_start_date()} \
+                    for name in self.names],
+                separators=(',', ':'),
+                ensure_ascii=False
+            )
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value: str):
+    """ Return datetime.date of a str in iso format. Results are cached. """
+
+    return datetime.date.fromisoformat(value)
+
+@lru_cache(maxsize=2048)
+def parse_time(value: str):
+    """ Return datetime.time of a str in %H:%M format. Results are cached. """
+
+    return datetime.datetime.strptime(value, "%H:%M").time()
+
+def date_ranges(_from, to, days: int):
+    """
+    Split the interval _from-to -both included- in consecutive intervals of
+    max days length. Return a list of (_from, to) tuples of iso str.
+    """
+
+    if not isinstance(_from, datetime.date):
+        _from = parse_date(_from)
+    if not isinstance(to, datetime.date):
+        to = parse_date(to)
+
+    ranges = []
+    while _from <= to:
+        end = min(_from + datetime.timedelta(days=days - 1), to)
+        ranges.append((_from.isoformat(), end.isoformat()))
+        _from = end + datetime.timedelta(days=1)
+
+    return ranges
+
+def merge_responses(responses: list, rows: tuple = ('days', 'results', \
+        'clockings')):
+    """
+    Merge the responses of consecutive date intervals in one response. Lists
+    of rows keys are concatenated in order, other lists -like the info of
+    types- get the items not present yet and other values are taken from
+    the first response.
+    """
+
+    if not responses:
+        return None
+
+    if all(isinstance(response, list) for response in responses):
+        return [row for response in responses for row in response]
+
+    merged = copy.copy(responses[0])
+    for response in responses[1:]:
+        for key, value in response.items():
+            if not isinstance(value, list) or \
+                    not isinstance(merged.get(key), list):
+                merged.setdefault(key, value)
+            elif key in rows:
+                merged[key] = merged[key] + value
+            else:
+                merged[key] = merged[key] + \
+                    [item for item in value if item not in merged[key]]
+
+    return merged
+
+def cube_to_dataframe(cube: list, dimensions: list, dtypes: dict = None):
+    """
+    Convert a response of Client.get_cube_results() to a pandas DataFrame
+    with a row by leaf node. The columns are the fields of all dimensions
+    -the keys- followed by the fields of the last dimension -the values-.
+
+    :param cube: list of nodes with 'dimKey', 'values' and 'children' keys.
+    :param dimensions: List of list used to get the cube.
+    :param dtypes: (optional) dict of column: pandas dtype to apply.
+
+    :return: :class:`pandas.DataFrame` object
+    :rtype: pandas.DataFrame
+    """
+
+    keys = [name for dimension in dimensions[:-1] for name in dimension]
+    names = keys + list(dimensions[-1])
+
+    # built by column, without intermediate row dicts
+    columns = [[] for _ in names]
+
+    # depth first, keeping the order of the nodes
+    stack = [(node, ()) for node in reversed(cube)]
+    while stack:
+        node, prefix = stack.pop()
+        prefix = prefix + tuple(node.get('dimKey') or [])
+
+        children = node.get('children')
+        if children:
+            stack.extend((child, prefix) for child in reversed(children))
+            continue
+
+        # leaf nodes of upper levels have empty keys
+        prefix = prefix[:len(keys)] + (None,) * (len(keys) - len(prefix))
+        values = tuple(node.get('values') or [])
+        values = values + (None,) * (len(names) - len(keys) - len(values))
+
+        for column, value in zip(columns, prefix + values):
+            column.append(value)
+
+    df = pd.DataFrame(dict(zip(names, columns)), columns=names)
+
+    # typed columns
+    for name, dtype in (dtypes or {}).items():
+        if name in df.columns and dtype:
+            try:
+                df[name] = df[name].astype(dtype)
+            except (TypeError, ValueError):
+                pass
+
+    return df
+
+def iter_json_rows(file, chunk_size: int = 65536, lines: bool = False):
+    """
+    Yield the items of a json array, or the lines of a json lines file,
+    reading file in chunks.
+
+    :param file: Text file object.
+    :param chunk_size: (int) Chars read at once.
+    :param lines: (bool) True if file is json lines, whose rows can be
+        arrays too. Otherwise a top level array is expected.
+    :return: Generator of json objects.
+    """
+
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = '', 0, False
+    in_array = False if lines else None
+
+    while True:
+        # skip separators of the values
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+            pos += 1
+
+        # need more data to decode the next value
+        if pos >= len(buffer) - 1 and not eof:
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+
+        if pos >= len(buffer):
+            return
+
+        # array of rows or json lines
+        if in_array is None:
+            in_array = buffer[pos] == '['
+            if in_array:
+                pos += 1
+            continue
+
+        if in_array and buffer[pos] == ']':
+            return
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except ValueError:
+            if eof:
+                raise
+            value, end = None, None
+
+        # incomplete value -or a number split by the chunk, like "10." of
+        # "10.25"- unless a separator follows it
+        if end is None or (not eof and (end == len(buffer) or \
+                buffer[end] not in ' \t\r\n,]')):
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+
+        pos = end
+        yield value
+
+
+def iter_export_rows(path: str, fmt: str = None, encoding: str = 'utf-8', \
+        delimiter: str = None, chunk_size: int = 65536):
+    """
+    Yield the rows of a csv or json export -see download_app_resource()-
+    without loading the whole file in memory.
+
+    :param path: str with path of the export.
+    :param fmt: (str) 'csv', 'json' or 'jsonl'. Extension of path by
+        default.
+    :param encoding: (str) Encoding of the file.
+    :param delimiter: (str) Delimiter of csv. Sniffed from the file if None.
+    :param chunk_size: (int) Chars read at once of json files.
+    :return: Generator of dicts -csv rows- or json objects.
+    """
+
+    fmt = (fmt or os.path.splitext(path)[1].lstrip('.')).lower()
+    if fmt not in ('csv', 'json', 'jsonl'):
+        raise ValueError(f"Formato de exportación no soportado: '{fmt}'.")
+
+    with open(path, 'r', encoding=encoding, newline='') as file:
+        if fmt != 'csv':
+            yield from iter_json_rows(
+                file, chunk_size=chunk_size, lines=fmt == 'jsonl')
+            return
+
+        # delimiter from a sample of the file
+        if delimiter is None:
+            sample = file.read(chunk_size)
+            file.seek(0)
+            try:
+                delimiter = csv.Sniffer().sniff(sample, ',;\t|').delimiter
+            except csv.Error:
+                delimiter = ','
+
+        yield from csv.DictReader(file, delimiter=delimiter)
+
+
+class AsyncTask:
+
+    def __init__(self, client, task: int, **kwargs):
+        """
+        Handle of a nettime async task. The status is polled with exponential
+        backoff and jitter until the task is completed, the deadline expires
+        or the task is cancelled.
+
+        :param client: :class:`Client` used to consult the task.
+        :param task: (int) Id of the nettime async task.
+        :param \*\*kwargs: Optional polling arguments. The Backoff arguments
+            -deadline, interval, max_interval, backoff, jitter- and
+            'callback': Callable receiving (task, status) after each request.
+
+        :return: :class:`AsyncTask` object
+        :rtype: AsyncTask
+        """
+
+        self.client = client
+        self.task = task
 
-            return str(fields).replace("'", '"').replace(" ", "")
+        # polling settings
+        self.options = kwargs
+        self.callback = kwargs.get("callback", None)
+
+        self.future = None
+        self._cancel_event = threading.Event()
+
+    def __repr__(self):
+        return "{}(task={})".format(self.__class__.__name__, self.task)
+
+    @property
+    def cancelled(self):
+        """ Informs if the polling of the task was cancelled. """
+
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """ Stop polling the task. Waiting callers get CancelledError. """
+
+        self._cancel_event.set()
+
+        # avoid start if task is queued yet
+        if self.future:
+            self.future.cancel()
+
+    def done(self):
+        """ Informs if a started task has finished, failed or cancelled. """
+
+        return bool(self.future) and self.future.done()
+
+    def status(self):
+        """ Get status of the async task. """
+
+        return self.client.get_task_status(self.task)
+
+    def wait(self):
+        """ Block until the task is completed and return the last status. """
+
+        backoff = Backoff(**self.options)
+        while True:
+            if self.cancelled:
+                raise CancelledError(f"Tarea {self.task} cancelada.")
+
+            task_status = self.status()
+            if self.callback:
+                self.callback(self.task, task_status)
+
+            if task_status.get("completed", False):
+                return task_status
+
+            # wakes up immediately if cancel() is called
+            self._cancel_event.wait(backoff.next())
+
+    def fetch(self):
+        """ Wait the task and return its response. """
+
+        self.wait()
+        return self.client.get_async_response(self.task)
+
+    def start(self, executor: ThreadPoolExecutor):
+        """ Fetch the task in background with the executor received. """
+
+        self.future = executor.submit(self.fetch)
+        return self
+
+    def result(self, timeout: float = None):
+        """
+        Return the response of the task. If the task was started in background
+        wait at most timeout seconds, else poll it in the current thread.
+        """
+
+        if self.future:
+            return self.future.result(timeout)
+
+        return self.fetch()
 
 
 class Client:
@@ -72,12 +438,22 @@ class Client:
         :param url: Nettime url. Eg https://server-name:8091/.
         :param username: Nettime username.
         :param pwd: Nettime password.
+        :param \*\*kwargs: Optional arguments for the pooled session. See
+            more information in the get_session() documentation. Also
+            'cache_size', 'cache_ttl' and 'cache_path' of the metadata cache.
+            See more information in the transport.TTLCache documentation.
+            'session_store': True to share the login with clients of the same
+            process, or a transport.SessionStore object.
+            'limiter': adaptive concurrency limit of the requests to server.
+            See more information in the transport.get_limiter() documentation.
+            'retry': RetryPolicy -or max attempts- of the requests. 3 attempts
+            and cube queries as idempotent POST by default.
 
         :return: :class:`Client` object
         :rtype: Client
         """
 
-        super().__init__(*args, **kwargs)
+        super().__init__()
         self.client_url = urlparse(url)
         self.username = username
         self.pwd = b64encode(pwd.encode('utf-8'))
@@ -86,6 +462,40 @@ class Client:
         self.access_token = None
         self.headers = None
         self.user_rol = None
+        self._first_date = None
+
+        # pooled session reused by all requests of the client
+        self.session = self.get_session(**kwargs)
+
+        # requests in flight adjusted to the server, see AdaptiveLimiter
+        self.limiter = transport.get_limiter(kwargs.get("limiter", None), url)
+
+        # bounded retries of rejected requests, see RetryPolicy
+        self.retry = self.get_retry_policy(kwargs.get("retry", 3))
+
+        # login shared between clients, see SessionStore
+        session_store = kwargs.get("session_store", None)
+        if session_store is True:
+            session_store = SessionStore.shared()
+        self.session_store = session_store or None
+        self._connect_lock = threading.RLock()
+        self._reconnecting = False
+
+        # department tree index, see get_department_tree()
+        self._department_tree = None
+        self._department_lock = threading.RLock()
+
+        # metadata cache -fields, lookup containers, settings-
+        self.cache = TTLCache(
+            maxsize=kwargs.get("cache_size", 256),
+            ttl=kwargs.get("cache_ttl", 300),
+            path=kwargs.get("cache_path", None),
+            namespace=f'{self.client_url.geturl()}|{self.username}'
+        )
+
+        # executor for background tasks, created on demand
+        self._executor = None
+        self.max_workers = kwargs.get("max_workers", 10)
 
         #connect client automatically
         self.connect()
@@ -109,7 +519,7 @@ class Client:
         return self
 
     def __exit__(self, *args, **kwargs):
-        return self.disconnect()
+        return self.close()
 
     @property
     def is_connected(self):
@@ -117,11 +527,14 @@ class Client:
 
         return bool(self.headers) and bool(self.access_token)
 
-    def connect(self):
-        """ Connect the client to set access_token and headers values. """
+    @property
+    def store_key(self):
+        """ Key of the client sessions in the session store. """
 
-        if self.is_connected:
-            return
+        return (self.client_url.geturl(), self.username)
+
+    def login(self):
+        """ Login in nettime and return the new access_token. """
 
         # url and data prepare
         url = urljoin(self.client_url.geturl(), '/api/login')
@@ -129,29 +542,135 @@ class Client:
             "username": self.username,
             "pwd": b64decode(self.pwd).decode('utf-8'),
         }
-        response = requests.post(url, data=data)
+        response = self.session.post(url, data=data)
 
         if response.status_code not in range(200, 300):
             raise ConnectionError(response.text)
 
-        json_data = response.json()
+        json_data = codec.decode(response)
 
         if not json_data.get("ok"):
             raise ConnectionError(json_data.get("message"))
 
-        self.access_token = json_data.get("access_token")
+        return json_data.get("access_token")
+
+    def set_access_token(self, access_token: str, settings: dict = None):
+        """ Set access_token, headers and settings values of a session. """
+
+        self.access_token = access_token
         self.headers = self.get_headers()
-        self.settings = self.get_settings()
+        self.settings = settings or self.get_settings()
         self.user_rol = self.get_user_rol()
 
-    def reconnect(self):
-        """ Reconnect client cleaning headers and access_token. """
+        # first_date is resolved again from new settings
+        self._first_date = None
 
-        #clean token and headers for safety
-        self.access_token = None
-        self.headers = None
+    def open_session(self, expired: str = None):
+        """
+        Set a session reusing the one of the session store if it's not the
+        expired access_token, else login.
+        """
 
-        self.connect()
+        if not self.session_store:
+            return self.set_access_token(self.login())
+
+        # only one client logs in, the rest reuse its session
+        with self.session_store.lock(self.store_key):
+            stored = self.session_store.get(self.store_key)
+            if stored and stored.get("access_token") != expired:
+                return self.set_access_token(
+                    stored.get("access_token"), stored.get("settings"))
+
+            self.set_access_token(self.login())
+            self.session_store.set(self.store_key, {
+                "access_token": self.access_token,
+                "settings": self.settings,
+            })
+
+    def connect(self):
+        """ Connect the client to set access_token and headers values. """
+
+        if self.is_connected:
+            return
+
+        with self._connect_lock:
+            if not self.is_connected:
+                self.open_session()
+
+    def reconnect(self, token: str = None):
+        """
+        Reconnect client replacing headers and access_token. If token is the
+        expired access_token and other thread has replaced it already, the
+        new one is used instead of login again.
+        """
+
+        with self._connect_lock:
+            # session rejected again while this thread reconnects
+            if self._reconnecting:
+                raise ConnectionError("Sesión rechazada luego de reconectar.")
+
+            # reconnected by other thread
+            if token and self.is_connected and self.access_token != token:
+                return
+
+            self._reconnecting = True
+            try:
+                self.open_session(expired=token or self.access_token)
+            finally:
+                self._reconnecting = False
+
+    def send(self, method: str, **query):
+        """
+        Sends a request with the session, inside a slot of the limiter if the
+        requests are limited.
+
+        :param method: Method for the new :class:`Request` object.
+        :param \*\*query: Arguments that ``request`` takes.
+        :return: :class:`requests.Response` object
+        :rtype: requests.Response
+        """
+
+        if not self.limiter:
+            return self.session.request(method, **query)
+
+        return self.limiter.call(self.session.request, method, **query)
+
+    def request(self, method: str, path: str, idempotent: bool = None, \
+            headers: dict = None, **query):
+        """
+        Sends a request with self.send() and the retry policy of the client.
+        On 401 the client is reconnected -once for all threads- and the
+        request is sent again with the new session.
+
+        :param method: Method for the new :class:`Request` object.
+        :param path: path to add to URL for the new :class:`Request` object.
+        :param idempotent: (bool) Override the idempotency rules of the
+            retry policy.
+        :param headers: (dict) Optional headers added to the client headers.
+        :param \*\*query: Arguments that ``request`` takes.
+        :return: :class:`requests.Response` object
+        :rtype: requests.Response
+        """
+
+        token = None
+
+        def send():
+            nonlocal token
+
+            # session used by this attempt
+            token = self.access_token
+            return self.send(
+                method,
+                url=urljoin(self.client_url.geturl(), path),
+                headers={**self.headers, **(headers or {})},
+                **query
+            )
+
+        return self.retry.call(
+            send, method, path,
+            idempotent=idempotent,
+            on_unauthorized=lambda: self.reconnect(token)
+        )
 
     def get(self, path: str, params: dict = None, **kwargs):
         """
@@ -168,22 +687,14 @@ class Client:
         if not self.is_connected:
             raise ConnectionError("Cliente desconectado. Utilice connect().")
         
-        # query prepare
-        query = {
-            "url": urljoin(self.client_url.geturl(), path),
-            "params": params,
-            "headers": self.headers,
-            "timeout": kwargs.get("timeout", 10),
-            "stream": kwargs.get("stream", False)
-        }
-
         # consulting nettime
-        response = requests.get(**query)
-
-        # if session was closed, reconect client and try again
-        if response.status_code == 401:
-            self.reconnect()
-            return self.get(path, params=params, **kwargs)
+        response = self.request(
+            'GET', path,
+            idempotent=kwargs.get("idempotent", None),
+            params=params,
+            timeout=kwargs.get("timeout", 10),
+            stream=kwargs.get("stream", False)
+        )
 
         # raise if was an error
         if response.status_code not in range(200, 300):
@@ -194,7 +705,7 @@ class Client:
             return response
 
         # to json
-        return response.json()
+        return codec.decode(response)
 
     def post(self, path, data=None, json=None, **kwargs):
         """
@@ -205,7 +716,10 @@ class Client:
             object to send in the body of the :class:`Request`.
         :param json: (optional) json data to send in the body of the 
             :class:`Request`.
-        :param \*\*kwargs: Optional arguments that ``request`` takes.
+        :param \*\*kwargs: Optional arguments that ``request`` takes. Use
+            'task_response': False to get the taskId of an async task instead
+            of its response, and 'idempotent': True or False to override the
+            idempotency rules of the retry policy.
         :return: json object
         :rtype: json
         """
@@ -214,38 +728,79 @@ class Client:
         if not self.is_connected:
             raise ConnectionError("Cliente desconectado. Utilice connect().")
 
-        # query prepare
-        query = {
-            "url": urljoin(self.client_url.geturl(), path),
-            "data": data,
-            "json": json,
-            "headers": self.headers,
-            "timeout": kwargs.get("timeout", 10)
-        }
+        # json body encoded with the codec in use
+        if json is not None and data is None:
+            data, json = codec.dumps(json), None
 
         # consulting nettime
-        response = requests.post(**query)
-
-        # if session was closed, reconect client and try again
-        if response.status_code == 401:
-            self.reconnect()
-            return self.post(path, data=data, json=json, **kwargs)
+        response = self.request(
+            'POST', path,
+            idempotent=kwargs.get("idempotent", None),
+            data=data,
+            json=json,
+            timeout=kwargs.get("timeout", 10)
+        )
 
         # raise if was an error
         if response.status_code not in range(200, 300):
             raise ConnectionError(response.status_code, response.text)
 
         # to json -> json
-        json_response = response.json()
+        json_response = codec.decode(response)
 
         # get task results if is generated
-        if isinstance(json_response, dict) and \
+        if kwargs.get("task_response", True) and \
+                isinstance(json_response, dict) and \
                 json_response.get('taskId', None):
-            json_response = self.get_task_response(json_response.get('taskId'))
+            json_response = self.get_task_response(
+                json_response.get('taskId'), **kwargs)
 
         # return json response
         return json_response
 
+    def get_retry_policy(self, retry):
+        """
+        Return the RetryPolicy of the client.
+
+        :param retry: :class:`RetryPolicy` object, or max attempts to use the
+            default policy of nettime.
+        :return: :class:`RetryPolicy` object
+        :rtype: RetryPolicy
+        """
+
+        if isinstance(retry, RetryPolicy):
+            return retry
+
+        # cube results are queries sent by POST
+        return RetryPolicy(
+            attempts=retry or 1,
+            idempotent_posts=('/api/data/cube',)
+        )
+
+    def get_session(self, pool_connections: int = 10, pool_maxsize: int = 10, \
+            max_retries: int = 0, keep_alive: bool = True, **kwargs):
+        """
+        Create a :class:`requests.Session` with pooled adapters mounted, so the
+        TCP/TLS connections are reused between requests.
+
+        :param pool_connections: (int) Number of connection pools to cache.
+        :param pool_maxsize: (int) Max number of connections saved in pool.
+            Use at least the number of threads sharing the client.
+        :param max_retries: (int) Retries of each connection at socket level.
+        :param keep_alive: (bool) False to close connection after each request.
+
+        :return: :class:`requests.Session` object
+        :rtype: requests.Session
+        """
+
+        # same pooled sessions of the other api clients
+        return transport.get_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            keep_alive=keep_alive
+        )
+
     def get_headers(self):
         """ Return headers for a specific conection """
 
@@ -259,35 +814,99 @@ class Client:
             "Cookie": f"sessionID={self.access_token}; i18next=es",
         }
 
-    def disconnect(self):
-        """ Disconnect a client to clean the access_token. """
+    def disconnect(self, logout: bool = False):
+        """
+        Disconnect a client to clean the access_token. Sessions of a session
+        store are kept alive for other clients unless logout is True.
+        """
 
         if not self.is_connected:
             return
         
         # disconnect ...
-        response = self.post(path='/api/logout')
+        if not self.session_store:
+            response = self.post(path='/api/logout')
+
+        elif logout:
+            with self.session_store.lock(self.store_key):
+                self.session_store.discard(self.store_key, self.access_token)
+                response = self.post(path='/api/logout')
 
         # reset values
         self.access_token = None
         self.headers = None
 
-    def get_settings(self):
+    def close(self):
+        """ Disconnect the client and release the pooled connections. """
+
+        self.disconnect()
+        self.session.close()
+
+        # persist metadata if path was set
+        self.cache.save()
+
+        # stop background tasks
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @property
+    def executor(self):
+        """ Thread pool used to run background tasks of the client. """
+
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        return self._executor
+
+    def get_settings(self, cache: bool = True):
         """ Get settings of netTime Server. """
 
-        return self.get(path='/api/settings')
+        if cache:
+            settings = self.cache.get(('settings', None))
+            if settings is not None:
+                return settings
+
+        settings = self.get(path='/api/settings')
+        self.cache.set(('settings', None), settings)
+
+        return settings
+
+    def invalidate_cache(self, container: str = None):
+        """ Remove cached metadata of a container, or all if is None. """
+
+        self.cache.invalidate(container)
+
+        if container in (None, "Arbol"):
+            self._department_tree = None
 
     def get_user_rol(self):
         """ Get user_rol of current session. """
 
         return self.settings.get('rol', None)
 
-    def get_days_offset(self, days: list):
+    @property
+    def first_date(self):
+        """ First day of self.setting.firstDate as numpy datetime64. """
+
+        if self._first_date is None:
+            firstYear = self.settings.get('firstDate', None)
+            if not firstYear:
+                raise RuntimeError("No se puede obtener el setting firstDate.")
+
+            self._first_date = np.datetime64(f'{firstYear:04d}-01-01', 'D')
+
+        return self._first_date
+
+    def get_days_offset(self, days, as_array: bool = False):
         """ 
-        Convert a list of datetime.date or str format to int offset with 
-        self.setting.firstDate.
+        Convert days in datetime.date or str format to int offset with 
+        self.setting.firstDate. numpy arrays and pandas objects are converted
+        vectorized.
 
-        :param days: list of datetime.date or formatted str to get int offsets.
+        :param days: list, numpy array, pandas Series or DatetimeIndex of
+            datetime.date or formatted str to get int offsets.
+        :param as_array: (bool) True to get a numpy array instead of list.
         
         :return: :class:`list` object
         :rtype: list
@@ -297,54 +916,63 @@ class Client:
         if not self.is_connected:
             raise ConnectionError("Cliente desconectado. Utilice connect().")
 
-        firstYear = self.settings.get('firstDate', None)
-        if not firstYear:
-            raise RuntimeError("No se puede obtener el setting firstDate.")
-        
-        # set first_date
-        first_date = datetime.date(firstYear, 1, 1)
+        # numpy arrays and pandas objects are converted vectorized
+        if isinstance(days, np.ndarray) or hasattr(days, 'to_numpy'):
+            days = np.asarray(days)
+            if days.dtype.kind == 'O':
+                days = days.astype(str)
 
-        # process dates
-        days_numbers = []
-        for day in days:
-            # ensure datetime.date type
-            if not isinstance(day, datetime.date):
-                day = datetime.date.fromisoformat(day)
+            offsets = (days.astype('datetime64[D]') - self.first_date) \
+                .astype(np.int64)
+
+            return offsets if as_array else offsets.tolist()
+
+        # python objects are faster with ordinals than with numpy parsing
+        first = self.first_date.astype(datetime.date).toordinal()
+        offsets = [
+            (day if isinstance(day, datetime.date) \
+                else datetime.date.fromisoformat(day)).toordinal() - first
+            for day in days
+        ]
+
+        return np.array(offsets, dtype=np.int64) if as_array else offsets
+
+    def get_days_range_offset(self, start, end):
+        """
+        Convert an interval of days -both included- to a range of int offsets
+        with self.setting.firstDate, without materializing every day.
+
+        :param start: datetime.date or formatted str of the first day.
+        :param end: datetime.date or formatted str of the last day.
 
-            delta = day - first_date
-            days_numbers.append(delta.days)
+        :return: :class:`range` object
+        :rtype: range
+        """
 
-        return days_numbers
+        first, last = self.get_days_offset([start, end])
+        return range(first, last + 1)
 
-    def get_days_from_offsets(self, offsets: list):
+    def get_days_from_offsets(self, offsets, as_array: bool = False):
         """ 
-        Convert a list of int offset to datetime.date or str format with \
-        self.setting.firstDate.
+        Convert int offsets to str format with self.setting.firstDate. The
+        conversion is vectorized with numpy.
 
-        :param offsets: list of int to get dates.
+        :param offsets: list, range, numpy array or pandas Series of int.
+        :param as_array: (bool) True to get a numpy datetime64 array instead
+            of list of str.
         
-        :return: :class:`datetime.date` object
-        :rtype: datetime.date
+        :return: :class:`list` object
+        :rtype: list
         """
 
         # wait active conection
         if not self.is_connected:
             raise ConnectionError("Cliente desconectado. Utilice connect().")
 
-        firstYear = self.settings.get('firstDate', None)
-        if not firstYear:
-            raise RuntimeError("No se puede obtener el setting firstDate.")
-
-        # set first_date
-        first_date = datetime.date(firstYear, 1, 1)
-
         # process dates
-        dates = []
-        for offset in offsets:
-            date = first_date + datetime.timedelta(days=offset)
-            dates.append(date.isoformat())
-        
-        return dates
+        dates = self.first_date + np.asarray(offsets, dtype=np.int64)
+
+        return dates if as_array else dates.astype(str).tolist()
 
     def get_app_resource(self, name: str, **kwargs):
         """
@@ -360,18 +988,167 @@ class Client:
 
         # request.get
         return self.get(path=f'/AppResources/{name}', **kwargs)
-        
-    def get_fields(self, container: str, filterFields: bool = False):
+
+    def download_app_resource(self, name: str, dest: str, \
+            chunk_size: int = 1048576, resume: bool = True, \
+            algorithm: str = 'sha256', **kwargs):
+        """
+        Download a resource from 'AppResources' folder to dest, writing it in
+        chunks without loading it in memory. The file is written in
+        dest + '.part' until it's complete, and a partial download is resumed
+        with a Range request if the ETag -or Last-Modified- of the resource
+        didn't change. The checksum is computed while downloading.
+
+        :param name: str with name of resource -including extension-.
+        :param dest: str with path of the file to create.
+        :param chunk_size: (int) Bytes read and written at once. 1 MB default.
+        :param resume: (bool) False to download the resource again even if a
+            partial file exists.
+        :param algorithm: (str) Name of the hashlib algorithm of checksum.
+        :param \*\*kwargs: Optional arguments. 'timeout' in seconds.
+
+        :return: :class:`dict` object with 'path', 'size', 'checksum' and
+            'resumed' -bytes that were already downloaded- keys.
+        :rtype: dict
+        """
+
+        if not self.is_connected:
+            raise ConnectionError("Cliente desconectado. Utilice connect().")
+
+        part_path = f'{dest}.part'
+
+        # ETag or Last-Modified of the version written in part_path
+        validator_path = f'{part_path}.validator'
+        validator = None
+        if resume and os.path.exists(validator_path):
+            with open(validator_path, 'r') as file:
+                validator = file.read().strip() or None
+
+        # partial file of an unknown version is downloaded again
+        if not validator:
+            for path in (part_path, validator_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        checksum = hashlib.new(algorithm)
+        resumed = 0
+
+        # bytes of a previous download are part of the checksum
+        if os.path.exists(part_path):
+            with open(part_path, 'rb') as file:
+                for chunk in iter(lambda: file.read(chunk_size), b''):
+                    checksum.update(chunk)
+                    resumed += len(chunk)
+
+        size, total = resumed, None
+        backoff = self.retry.get_backoff()
+        attempt = 0
+
+        while True:
+            attempt += 1
+
+            # bytes of a version that can't be validated are not resumed
+            if size and not validator:
+                checksum = hashlib.new(algorithm)
+                size = resumed = 0
+
+            # ranges are bytes of the file, never of a compressed body. The
+            # server sends all the file if it changed, see If-Range
+            headers = {"Accept-Encoding": "identity"}
+            if size:
+                headers["Range"] = f'bytes={size}-'
+                headers["If-Range"] = validator
+
+            response = self.request(
+                'GET', f'/AppResources/{name}',
+                headers=headers,
+                timeout=kwargs.get("timeout", 10),
+                stream=True
+            )
+
+            # range out of file, the partial download is complete
+            if response.status_code == 416 and size:
+                response.close()
+                break
+
+            if response.status_code not in range(200, 300):
+                raise ConnectionError(response.text)
+
+            # server ignored the range or file changed, download all again
+            if response.status_code == 200 and size:
+                checksum = hashlib.new(algorithm)
+                size = resumed = 0
+
+            # version of the file, weak etags are not valid in If-Range
+            if response.status_code == 200:
+                etag = response.headers.get("ETag", "")
+                validator = etag if etag and not etag.startswith('W/') \
+                    else response.headers.get("Last-Modified")
+
+                if validator:
+                    with open(validator_path, 'w') as file:
+                        file.write(validator)
+                elif os.path.exists(validator_path):
+                    os.remove(validator_path)
+
+            content_range = response.headers.get("Content-Range", "")
+            if '/' in content_range:
+                total = content_range.rsplit('/', 1)[1]
+                total = int(total) if total.isdigit() else None
+            elif response.headers.get("Content-Length", "").isdigit():
+                total = int(response.headers["Content-Length"])
+
+            try:
+                with open(part_path, 'ab' if size else 'wb') as file:
+                    for chunk in response.iter_content(chunk_size):
+                        file.write(chunk)
+                        checksum.update(chunk)
+                        size += len(chunk)
+                break
+            except requests.RequestException as error:
+                # connection lost, resume from the bytes written
+                delay = self.retry.next_delay(attempt, backoff, 'GET', \
+                    f'/AppResources/{name}', error=error)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+            finally:
+                response.close()
+
+        if total is not None and size != total:
+            raise ConnectionError(
+                f"Descarga incompleta de {name}: {size} de {total} bytes.")
+
+        os.replace(part_path, dest)
+        if os.path.exists(validator_path):
+            os.remove(validator_path)
+
+        return {
+            "path": dest,
+            "size": size,
+            "checksum": checksum.hexdigest(),
+            "resumed": resumed,
+        }
+
+    def get_fields(self, container: str, filterFields: bool = False, \
+            cache: bool = True):
         """
         Get all fields of an specific container.
         
         :param container: (str) Name of nettime container.
         :param filterFields: (bool) True if needs ignore expression fields.
+        :param cache: (bool) False to ignore the cached fields.
         
         :return: json object
         :rtype: json
         """
 
+        key = ('fields', container, filterFields)
+        if cache:
+            fields = self.cache.get(key)
+            if fields is not None:
+                return fields
+
         # prepare task parameters
         params = {
             "container": container,
@@ -379,7 +1156,10 @@ class Client:
         }
 
         # request.get
-        return self.get(path='/api/container/fields', params=params)
+        fields = self.get(path='/api/container/fields', params=params)
+        self.cache.set(key, fields)
+
+        return fields
     
     def get_elements(self, container: str, query = Query(["id", "name"]), \
             *args, **kwargs):
@@ -390,7 +1170,9 @@ class Client:
         :param query: (Query) Fields you want to get. Must be an instanceb of
             nettime6.Query. See more information in the class documentation.
 
-        :param \*\*kwargs: Optional arguments that ``request`` takes.
+        :param \*\*kwargs: Optional arguments that ``request`` takes. Use
+            'cache': True for nearly static containers, to reuse the response
+            until it expires or the container is saved.
 
         :return: json object
         :rtype: json
@@ -398,7 +1180,7 @@ class Client:
 
         # prepare task parameters
         params = {
-            "pageStartIndex": 0,
+            "pageStartIndex": kwargs.get("pageStartIndex", 0),
             "pageSize": kwargs.get("pageSize", 50),
             "search": kwargs.get("search", ""),
             "order": kwargs.get("order", ""),
@@ -407,15 +1189,73 @@ class Client:
             "query": query.prepare()
         }
 
+        # cached response
+        key = ('elements', container, tuple(sorted(params.items())))
+        if kwargs.get("cache", False):
+            json_response = self.cache.get(key)
+            if json_response is not None:
+                return json_response
+
         # request.get -> json
         json_response = self.get(path='/api/container/elements', params=params)
 
         # get task results
         if json_response.get('taskId', None):
-            json_response = self.get_task_response(json_response.get('taskId'))
+            json_response = self.get_task_response(
+                json_response.get('taskId'), **kwargs)
+
+        if kwargs.get("cache", False):
+            self.cache.set(key, json_response)
 
         return json_response
 
+    def iter_elements(self, container: str, query = Query(["id", "name"]), \
+            page_size: int = 50, prefetch: bool = False, **kwargs):
+        """
+        Iterate over all elements of an specific container, requesting the
+        pages lazily. Only one page -two with prefetch- is kept in memory.
+
+        :param container: (str) Name of nettime container.
+        :param query: (Query) Fields you want to get. Must be an instanceb of
+            nettime6.Query. See more information in the class documentation.
+        :param page_size: (int) Number of elements requested by page.
+        :param prefetch: (bool) True to request the next page in background
+            while the current one is processed.
+        :param \*\*kwargs: Optional arguments that ``get_elements`` takes.
+
+        :return: generator of elements
+        :rtype: generator
+        """
+
+        def get_page(start: int):
+            return self.get_elements(
+                container=container,
+                query=query,
+                pageStartIndex=start,
+                pageSize=page_size,
+                **kwargs
+            )
+
+        start = 0
+        page = get_page(start)
+        while True:
+            items = page.get('items') or []
+            start += len(items)
+
+            # last page reached
+            last = len(items) < page_size or start >= page.get('total', 0)
+
+            # request next page while current is consumed
+            if prefetch and not last:
+                future = self.executor.submit(get_page, start)
+
+            yield from items
+
+            if last:
+                return
+
+            page = future.result() if prefetch else get_page(start)
+
     def get_employees(self, query=Query(["id", "nif"]), *args, **kwargs):
         """
         Get employees from nettime. 
@@ -467,7 +1307,12 @@ class Client:
         }
 
         # executing and processing
-        return self.container_action_exec(**data)
+        response = self.container_action_exec(**data)
+
+        # cached elements of container are outdated
+        self.invalidate_cache(container)
+
+        return response
 
     def delete_element(self, container: str, elements: list, \
             _confirm: bool = True, _all: bool = False):
@@ -488,7 +1333,12 @@ class Client:
             }
 
         # executing and processing
-        return self.container_action_exec(**data)
+        response = self.container_action_exec(**data)
+
+        # cached elements of container are outdated
+        self.invalidate_cache(container)
+
+        return response
 
     def get_for_duplicate(self, container: str, element: int, \
             _all: bool = False):
@@ -554,7 +1404,7 @@ class Client:
 
     def get_day_info(self, employee: int, \
             _from: str = datetime.date.today().isoformat(), \
-            to: str = datetime.date.today().isoformat()):
+            to: str = datetime.date.today().isoformat(), **kwargs):
         """ 
         Get info, days, shifts, and results for a employe in a specific period. 
         """
@@ -567,11 +1417,11 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path='/api/day/results', params=params)
+        return self.get(path='/api/day/results', params=params, **kwargs)
 
     def get_access_clockings(self, employee: int, \
             _from: str = datetime.date.today().isoformat(), \
-            to: str = datetime.date.today().isoformat()):
+            to: str = datetime.date.today().isoformat(), **kwargs):
         """ Get access clockings for a employe in a specific period. """
 
         # prepare task parameters
@@ -582,7 +1432,53 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path='/api/access/clockings', params=params)
+        return self.get(path='/api/access/clockings', params=params, **kwargs)
+
+    def get_sharded(self, method: str, employees: list, _from: str, to: str, \
+            days: int = 7, max_workers: int = 4, **kwargs):
+        """
+        Split (employees x date range) in work units of max days length and
+        request them in parallel. Failed requests are retried by the retry
+        policy of the client.
+
+        :param method: (str) Name of the method to use. One of 'get_day_info',
+            'get_results' or 'get_access_clockings'.
+        :param employees: list of employee ids.
+        :param _from: First day of the range.
+        :param to: Last day of the range.
+        :param days: (int) Max days of each work unit.
+        :param max_workers: (int) Max work units requested at same time.
+        :param \*\*kwargs: Optional arguments of the method, like 'timeout'.
+
+        :return: :class:`dict` object of employee: response of the whole
+            range, with the work units merged in date order. See more
+            information in the merge_responses() documentation.
+        :rtype: dict
+        """
+
+        if method not in ('get_day_info', 'get_results', \
+                'get_access_clockings'):
+            raise ValueError(f"Método {method} no soportado.")
+
+        func = getattr(self, method)
+
+        def fetch(unit: tuple):
+            employee, interval = unit
+            return func(employee, interval[0], interval[1], **kwargs)
+
+        intervals = date_ranges(_from, to, days)
+        units = [(emp, interval) for emp in employees for interval in intervals]
+
+        # responses by employee in order
+        responses = {employee: [] for employee in employees}
+        for unit, response in zip(units, bounded_map(fetch, units, \
+                max_workers)):
+            responses[unit[0]].append(response)
+
+        return {
+            employee: merge_responses(items) \
+                for employee, items in responses.items()
+        }
 
     def get_task_status(self, task: int):
         """ Get status of an async task. """
@@ -595,13 +1491,8 @@ class Client:
         # request.get -> json
         return self.get(path='/api/async/status', params=params)
 
-    def get_task_response(self, task: int):
-        """ Return the result of a async task. """
-
-        # ensure the task is complete
-        task_status = self.get_task_status(task)
-        while not task_status.get("completed", False):
-            task_status = self.get_task_status(task)
+    def get_async_response(self, task: int):
+        """ Get response of a completed async task. """
 
         # prepare task parameters
         params = {
@@ -611,45 +1502,217 @@ class Client:
         # request.get -> json
         return self.get(path='/api/async/response', params=params)
 
-    def get_results(self, employee: int, \
-            _from: str = datetime.date.today().isoformat(), \
-            to: str = datetime.date.today().isoformat()):
-        """ Get results of day for a employee. """
+    def get_task_response(self, task: int, wait: bool = True, **kwargs):
+        """
+        Return the result of a async task.
 
-        # prepare task parameters
-        params = {
-            'idemp': employee,
-            'from': _from,
-            'to': to,
-        }
+        :param task: (int) Id of the nettime async task.
+        :param wait: (bool) False to return an :class:`AsyncTask` handle that
+            is fetched in background. Use handle.result() to get the response
+            and handle.cancel() to stop polling.
+        :param \*\*kwargs: Optional polling arguments. See more information in
+            the AsyncTask documentation.
 
-        # generate async task
-        async_task = self.get(path='/api/results', params=params)
+        :return: json object or :class:`AsyncTask` if not wait
+        :rtype: json
+        """
 
-        # get task results
-        return self.get_task_response(async_task.get('taskId'))
+        handle = AsyncTask(self, task, **kwargs)
 
-    def clocking_prepare(self, employee: int, date_time: datetime.datetime, \
-            reader: int = -1, clocking_id: int = -1, action: str = None):
-        """ Return a dict element with recived data. """
+        # background polling
+        if not wait:
+            return handle.start(self.executor)
 
-        # ensure datetime.datetime type
-        if not isinstance(date_time, datetime.datetime):
-            date_time = datetime.datetime.fromisoformat(date_time)
+        return handle.fetch()
 
-        # prepare structure
-        clocking_data = {
-            "id": clocking_id,
-            "action": action,
-            "app": True,
-            "type": "timetypes",
-            "date": date_time.isoformat(timespec='milliseconds'),
-            "idReader": reader,
-            "idElem": 0,
-            "isNew": True if clocking_id == -1 else False,
-        }
+    def create_task(self, path: str, params: dict = None, json: dict = None):
+        """
+        Generate an async task without wait it. Use GET if json is not
+        received, else POST.
 
-        return clocking_data
+        :param path: path of the endpoint that generates the task. Eg.
+            '/api/results', '/api/clockings', '/api/planification/manager'.
+        :param params: (optional) Dictionary to send in the query string.
+        :param json: (optional) json data to send in the body.
+
+        :return: :class:`int` object
+        :rtype: int
+        """
+
+        if json is None:
+            response = self.get(path=path, params=params)
+        else:
+            response = self.post(path=path, json=json, task_response=False)
+
+        if not response.get('taskId', None):
+            raise ValueError(f"El endpoint {path} no generó una tarea.")
+
+        return response.get('taskId')
+
+    def wait_tasks(self, tasks, batch_size: int = 20, **kwargs):
+        """
+        Poll many async tasks together and yield each response as soon as its
+        task is completed. Every round checks the pending tasks in batches of
+        concurrent status requests and sleeps with backoff only if none of
+        them was completed.
+
+        :param tasks: dict of key: task id, or list of task ids.
+        :param batch_size: (int) Max status requests sent together.
+        :param \*\*kwargs: Optional polling arguments. See more information in
+            the AsyncTask documentation. The callback receives (key, status).
+
+        :return: generator of (key, response) tuples
+        :rtype: generator
+        """
+
+        # task ids as keys by default
+        if not isinstance(tasks, dict):
+            tasks = {task: task for task in tasks}
+
+        # polling settings
+        backoff = Backoff(**kwargs)
+        callback = kwargs.get("callback", None)
+
+        pending = list(tasks.items())
+        while pending:
+            finished = set()
+
+            for i in range(0, len(pending), batch_size):
+                batch = pending[i:i + batch_size]
+
+                # consult statuses of the batch together
+                statuses = self.executor.map(
+                    lambda item: self.get_task_status(item[1]), batch)
+
+                done = []
+                for item, task_status in zip(batch, statuses):
+                    if callback:
+                        callback(item[0], task_status)
+                    if task_status.get("completed", False):
+                        done.append(item)
+
+                # fetch and yield completed responses
+                responses = self.executor.map(
+                    lambda item: self.get_async_response(item[1]), done)
+                for item, response in zip(done, responses):
+                    finished.add(item[0])
+                    yield item[0], response
+
+            # keep order of the tasks not completed yet
+            pending = [item for item in pending if item[0] not in finished]
+
+            if not pending:
+                return
+
+            # reset backoff when some task has been completed
+            if finished:
+                backoff.reset()
+
+            time.sleep(backoff.next())
+
+    def iter_tasks(self, jobs: dict, batch_size: int = 20, **kwargs):
+        """
+        Generate many async tasks concurrently and yield each response as soon
+        as its task is completed.
+
+        :param jobs: dict of key: dict with 'path' and 'params' or 'json'
+            arguments of create_task(). Eg.
+            {1: {"path": '/api/planification/manager', "json": {...}}}
+        :param batch_size: (int) Max status requests sent together.
+        :param \*\*kwargs: Optional polling arguments. See more information in
+            the AsyncTask documentation.
+
+        :return: generator of (key, response) tuples
+        :rtype: generator
+        """
+
+        keys = list(jobs.keys())
+        tasks = self.executor.map(
+            lambda key: self.create_task(**jobs[key]), keys)
+
+        return self.wait_tasks(
+            dict(zip(keys, tasks)),
+            batch_size=batch_size,
+            **kwargs
+        )
+
+    def iter_results(self, employees: list, \
+            _from: str = datetime.date.today().isoformat(), \
+            to: str = datetime.date.today().isoformat(), **kwargs):
+        """
+        Get results of day for many employees at once. Yield (employee,
+        results) as soon as each task is completed.
+        """
+
+        jobs = {}
+        for employee in employees:
+            jobs[employee] = {
+                "path": '/api/results',
+                "params": {'idemp': employee, 'from': _from, 'to': to},
+            }
+
+        return self.iter_tasks(jobs, **kwargs)
+
+    def iter_day_clockings(self, employees: list, \
+            date: str = datetime.date.today().isoformat(), **kwargs):
+        """
+        Get the clockings of a day for many employees at once. Yield
+        (employee, clockings) as soon as each task is completed.
+        """
+
+        jobs = {}
+        for employee in employees:
+            jobs[employee] = {
+                "path": '/api/clockings',
+                "params": {
+                    'path': '/api/clockings',
+                    'method': 'get',
+                    'idemp': employee,
+                    'date': date,
+                },
+            }
+
+        return self.iter_tasks(jobs, **kwargs)
+
+    def get_results(self, employee: int, \
+            _from: str = datetime.date.today().isoformat(), \
+            to: str = datetime.date.today().isoformat(), **kwargs):
+        """ Get results of day for a employee. """
+
+        # prepare task parameters
+        params = {
+            'idemp': employee,
+            'from': _from,
+            'to': to,
+        }
+
+        # generate async task
+        async_task = self.get(path='/api/results', params=params)
+
+        # get task results
+        return self.get_task_response(async_task.get('taskId'), **kwargs)
+
+    def clocking_prepare(self, employee: int, date_time: datetime.datetime, \
+            reader: int = -1, clocking_id: int = -1, action: str = None):
+        """ Return a dict element with recived data. """
+
+        # ensure datetime.datetime type
+        if not isinstance(date_time, datetime.datetime):
+            date_time = datetime.datetime.fromisoformat(date_time)
+
+        # prepare structure
+        clocking_data = {
+            "id": clocking_id,
+            "action": action,
+            "app": True,
+            "type": "timetypes",
+            "date": date_time.isoformat(timespec='milliseconds'),
+            "idReader": reader,
+            "idElem": 0,
+            "isNew": True if clocking_id == -1 else False,
+        }
+
+        return clocking_data
         
     def post_clocking(self, employee: int, date: str, time: str, \
             reader: int = -1, *args, **kwargs):
@@ -660,10 +1723,10 @@ class Client:
 
         #teime process
         if not isinstance(date, datetime.date):
-            date = datetime.date.fromisoformat(date)
+            date = parse_date(date)
 
-        if not isinstance(date, datetime.time):
-            time = datetime.datetime.strptime(time, "%H:%M").time()
+        if not isinstance(time, datetime.time):
+            time = parse_time(time)
 
         date_time = datetime.datetime.combine(date, time)
 
@@ -683,8 +1746,89 @@ class Client:
 
         return self.post(path='/api/day/post/', json=json_data)
 
+    def add_clockings(self, records, max_workers: int = 4, \
+            rate: float = None):
+        """
+        Add many clockings. Records of the same employee and date are sent
+        together in one request, and requests run in parallel.
+
+        :param records: iterable of dict with 'employee', 'date' and 'time'
+            keys, and optional 'reader', 'action' and 'clocking_id' like
+            post_clocking().
+        :param max_workers: (int) Max requests running at same time.
+        :param rate: (float) Max requests by second. None to not limit.
+
+        :return: :class:`list` object with a dict by record, in order, with
+            'record', 'ok' and 'response' or 'error' keys.
+        :rtype: list
+        """
+
+        if self.user_rol == 'Persona':
+            raise ValueError("Método no soportado para el tipo 'Persona'.")
+
+        # outcome by record position
+        outcomes = {}
+
+        # group positions of records by (employee, date)
+        records = list(records)
+        groups = {}
+        for i, record in enumerate(records):
+            day = record.get("date")
+            try:
+                if not isinstance(day, datetime.date):
+                    day = parse_date(day)
+            except (TypeError, ValueError) as error:
+                outcomes[i] = {"ok": False, "error": error}
+                continue
+
+            groups.setdefault((record.get("employee"), day), []).append(i)
+
+        limiter = RateLimiter(rate)
+
+        def post_group(key: tuple):
+            employee, day = key
+            group = groups[key]
+
+            try:
+                clockings = []
+                for record in [records[i] for i in group]:
+                    hour = record.get("time")
+                    if not isinstance(hour, datetime.time):
+                        hour = parse_time(hour)
+
+                    clockings.append(self.clocking_prepare(
+                        employee=employee,
+                        date_time=datetime.datetime.combine(day, hour),
+                        reader=record.get("reader", -1),
+                        action=record.get("action", None),
+                        clocking_id=record.get("clocking_id", -1)
+                    ))
+
+                json_data = {
+                    "idEmp": employee,
+                    "date": day.isoformat(),
+                    "clockings": clockings,
+                }
+
+                limiter.acquire()
+                response = self.post(path='/api/day/post/', json=json_data)
+                outcome = {"ok": True, "response": response}
+
+            except Exception as error:
+                outcome = {"ok": False, "error": error}
+
+            return {i: outcome for i in group}
+
+        for result in bounded_map(post_group, list(groups), max_workers):
+            outcomes.update(result)
+
+        return [
+            {"record": record, **outcomes[i]} \
+                for i, record in enumerate(records)
+        ]
+
     def get_day_clockings(self, employee: int, \
-            date: str = datetime.date.today().isoformat()):
+            date: str = datetime.date.today().isoformat(), **kwargs):
         """
         Get all the clockings (Horario) of an employe in a specific day.
         ** This method use portal API.
@@ -702,7 +1846,7 @@ class Client:
         async_tasK = self.get(path='/api/clockings', params=params) 
 
         # get and return task results
-        return self.get_task_response(async_tasK.get('taskId'))
+        return self.get_task_response(async_tasK.get('taskId'), **kwargs)
 
     def add_clocking(self, employee: int, date: str, time: str, \
             reader: int = -1):
@@ -784,7 +1928,8 @@ class Client:
         }
         return self.save_element(**data)
 
-    def get_activity_monitor(self, employees: list, _from: str, to: str):
+    def get_activity_monitor(self, employees: list, _from: str, to: str, \
+            **kwargs):
         """ Return the activity monitor structure. """
         
         # prepare task parameters
@@ -795,17 +1940,16 @@ class Client:
             'ids': employees
         }
 
-        # generate async task
-        async_tasK = self.post(
+        # post resolves the async task with the polling arguments
+        return self.post(
             path='/api/planification/manager',
-            json=json_data
+            json=json_data,
+            **kwargs
         )
 
-        # get and return task results
-        return self.get_task_response(async_tasK.get('taskId'))
-
     def get_cube_results(self, dimensions: list, dateIni: str, dateEnd: str, \
-            interFilters: list = [], filters: list = [], ids: list = []):
+            interFilters: list = [], filters: list = [], ids: list = [], \
+            **kwargs):
         """
         Gets nettime results using the "Results Query" window engine.
 
@@ -817,6 +1961,7 @@ class Client:
             specify the ids of the results in this parameter.
         :param filters: (Optional) Nettime compatible filter expression.
         :param ids: (Optional) List of employee ids in case you want to filter.
+        :param \*\*kwargs: Optional polling arguments of get_task_response().
         
         :return: :class:`list` object
         :rtype: json
@@ -834,7 +1979,85 @@ class Client:
         }
 
         # post and return response
-        return self.post(path='/api/data/cube', json=json_data)
+        return self.post(path='/api/data/cube', json=json_data, **kwargs)
+
+    def get_cube_dtypes(self, container: str = "Persona"):
+        """ Return pandas dtypes of the fields of a container. """
+
+        dtypes = {"date": FIELD_DTYPES["date"]}
+        for field in self.get_fields(container).get('items', []):
+            dtype = FIELD_DTYPES.get(str(field.get('type')).lower())
+            if dtype:
+                dtypes[field.get('name')] = dtype
+
+        return dtypes
+
+    def get_cube_dataframe(self, dimensions: list, dateIni: str, \
+            dateEnd: str, interFilters: list = [], filters: list = [], \
+            ids: list = [], shard_days: int = None, max_workers: int = 4, \
+            arrow: bool = False, **kwargs):
+        """
+        Gets nettime results like get_cube_results() as a columnar pandas
+        DataFrame -or pyarrow Table- with a row by leaf node. Column dtypes
+        are inferred from the fields of the container.
+
+        :param shard_days: (int) Optional days of each sub-range. Long ranges
+            are split and requested in parallel. If "date" is not a dimension,
+            values of the sub-ranges are summed.
+        :param max_workers: (int) Max sub-ranges requested at same time.
+        :param arrow: (bool) True to return a pyarrow Table. Needs pyarrow.
+        :param \*\*kwargs: Optional polling arguments of get_task_response().
+
+        See more information of the rest of parameters in the
+        get_cube_results() documentation.
+
+        :return: :class:`pandas.DataFrame` object
+        :rtype: pandas.DataFrame
+        """
+
+        def get_frame(interval: tuple):
+            cube = self.get_cube_results(
+                dimensions=dimensions,
+                dateIni=interval[0],
+                dateEnd=interval[1],
+                interFilters=interFilters,
+                filters=filters,
+                ids=ids,
+                **kwargs
+            )
+            return cube_to_dataframe(cube, dimensions)
+
+        # one interval by default
+        intervals = [(dateIni, dateEnd)]
+        if shard_days:
+            intervals = date_ranges(dateIni, dateEnd, shard_days)
+
+        frames = list(bounded_map(get_frame, intervals, max_workers))
+        df = pd.concat(frames, ignore_index=True)
+
+        # merge totals of the sub-ranges
+        keys = [name for dimension in dimensions[:-1] for name in dimension]
+        if len(frames) > 1 and "date" not in keys:
+            df = df.groupby(keys, sort=False, dropna=False)[
+                list(dimensions[-1])].sum().reset_index()
+
+        # typed columns
+        for name, dtype in self.get_cube_dtypes().items():
+            if name in df.columns:
+                try:
+                    df[name] = df[name].astype(dtype)
+                except (TypeError, ValueError):
+                    pass
+
+        if arrow:
+            try:
+                import pyarrow
+            except ImportError:
+                raise ImportError("Se requiere pyarrow para arrow=True.")
+
+            return pyarrow.Table.from_pandas(df, preserve_index=False)
+
+        return df
 
     def set_employee_calendar(self, employee: int, calendar: str):
         """ Get a calendar with name and assign to employee. """
@@ -849,7 +2072,8 @@ class Client:
             fields=["id", "name"],
             filterExp=f"this.name == '{calendar}'"
         )
-        calendars = self.get_elements(container="Calendario", query=query)
+        calendars = self.get_elements(
+            container="Calendario", query=query, cache=True)
         if not calendars.get('total'):
             raise ValueError("No se encuentra el calendario.")
 
@@ -872,6 +2096,32 @@ class Client:
 
         return self.save_element(**data)
 
+    def get_department_tree(self, refresh: bool = False):
+        """
+        Load all the nodes of the department structure -container Arbol-
+        once and return an index of {(idNodeParent, name): id}. The index is
+        updated by create_department_node() and dropped by
+        invalidate_cache().
+
+        :param refresh: (bool) True to load the nodes again.
+
+        :return: :class:`dict` object
+        :rtype: dict
+        """
+
+        with self._department_lock:
+            if self._department_tree is None or refresh:
+                query = Query(fields=["id", "name", "idNodeParent"])
+                nodes = self.iter_elements(
+                    container="Arbol", query=query, page_size=500)
+
+                self._department_tree = {
+                    (node.get('idNodeParent'), node.get('name')): \
+                        node.get('id') for node in nodes
+                }
+
+            return self._department_tree
+
     def create_department_node(self, name: str, parent: int = -1, **kwargs):
         """ Create a new node in department structure. """
 
@@ -884,81 +2134,106 @@ class Client:
         node['idNodeParent'] = parent
         node['internalName'] = kwargs.get('internalName', None)
 
-        # save new node
-        new_elem = self.save_element(container="Arbol", dataObj=node)
+        # save_element() drops the tree index, keep it to update
+        with self._department_lock:
+            tree = self._department_tree
 
-        if new_elem[0].get('message') == EXIST_TEXT:
-            return self.create_department_node(
-                name=name,
-                parent=parent,
-                internalName=create_random_suffix(name),
-            )
-        
-        # if couldn't be created
-        if new_elem[0].get('type') != 6:
-            raise RuntimeError(new_elem[0].get('message'))
+            # save new node
+            new_elem = self.save_element(container="Arbol", dataObj=node)
+
+            if new_elem[0].get('message') == EXIST_TEXT:
+                self._department_tree = tree
+                return self.create_department_node(
+                    name=name,
+                    parent=parent,
+                    internalName=create_random_suffix(name),
+                )
+            
+            # if couldn't be created
+            if new_elem[0].get('type') != 6:
+                raise RuntimeError(new_elem[0].get('message'))
+
+            # add new node to the index
+            if tree is not None:
+                tree[(parent, name)] = new_elem[0].get('dataObject').get('id')
+            self._department_tree = tree
         
         return new_elem
 
-    def set_employee_department(self, employee: int, node_path: list, \
-            auto_create: bool = True):
-        """ Get a Department with list of names and assign to employee. """
+    def get_department_node(self, node_path: list, auto_create: bool = True):
+        """
+        Return the id of the node of a list of names, resolved with the
+        department tree index. Missing nodes are created if auto_create.
+        Return -1 if node_path is empty.
+        """
 
-        def make_filter(parent: int):
-            # create dynamic function
-            def node_filter(department):
-                return department['idNodeParent'] == parent
-            
-            # return fynamic func
-            return node_filter
-
-        depto_id_rel = {}
-        for i in range(len(node_path)):
-            # get elements by name
-            query = Query(
-                fields=["id", "name", "idNodeParent"],
-                filterExp=f"this.name = '{node_path[i]}'"
-            )
-            departs = self.get_elements(container="Arbol", query=query)
+        with self._department_lock:
+            tree = self.get_department_tree()
 
-            # create dynamic filter
-            filter_node = make_filter(depto_id_rel.get(node_path[i-1], -1))
+            node = -1
+            for name in node_path:
+                parent = node
+                node = tree.get((parent, name))
 
-            # filter elements
-            search = list(filter(filter_node, departs.get('items')))
+                if node is None:
+                    # raise if not auto_create
+                    if not auto_create:
+                        raise ValueError("Nodo no encontrado")
 
-            if not search:
-                # raise if not auto_create
-                if not auto_create:
-                    raise ValueError("Nodo no encontrado")
+                    # create node, it's added to the index
+                    new_node = self.create_department_node(
+                        name=name, parent=parent)
+                    node = new_node[0].get('dataObject').get('id')
 
-                # create node
-                new_node = self.create_department_node(
-                    name=node_path[i],
-                    parent=depto_id_rel.get(node_path[i-1], -1)
-                )
+            return node
 
-                # refresh search
-                search = [new_node[0].get('dataObject')]
-            
-            # put result in rels
-            depto_id_rel.update({node_path[i]: search[0].get('id')})
+    def set_employee_department(self, employee: int, node_path: list, \
+            auto_create: bool = True):
+        """ Get a Department with list of names and assign to employee. """
 
-        # department structure
-        object_assign = []
-        if node_path:
-            object_assign = [{'id': depto_id_rel.get(node_path[-1])}]
+        return self.set_employees_departments(
+            {employee: node_path},
+            auto_create=auto_create
+        )[0]
 
-        # saving data
-        data = {
-            "container": "Persona",
-            "elements": [employee],
-            "dataObj": {
-                "Departments": object_assign
+    def set_employees_departments(self, mapping: dict, \
+            auto_create: bool = True):
+        """
+        Assign departments to many employees. Employees that share a node are
+        saved together with one save_element() call.
+
+        :param mapping: dict of employee id: list of names of node path.
+        :param auto_create: (bool) Create the missing nodes.
+
+        :return: :class:`list` object with a response by node
+        :rtype: list
+        """
+
+        # group employees by node
+        groups = {}
+        for employee, node_path in mapping.items():
+            node = None
+            if node_path:
+                node = self.get_department_node(node_path, auto_create)
+
+            groups.setdefault(node, []).append(employee)
+
+        responses = []
+        for node, employees in groups.items():
+            # department structure
+            object_assign = [{'id': node}] if node is not None else []
+
+            # saving data
+            data = {
+                "container": "Persona",
+                "elements": employees,
+                "dataObj": {
+                    "Departments": object_assign
+                }
             }
-        }
+            responses.append(self.save_element(**data))
 
-        return self.save_element(**data)
+        return responses
 
     def get_timetypes_ids(self):
         """
@@ -966,7 +2241,7 @@ class Client:
         """
 
         # get nt resposne
-        nt_timetypes = self.get_elements("Incidencia").get('items')
+        nt_timetypes = self.get_elements("Incidencia", cache=True).get('items')
 
         # parse response to list
         timetypes = []
@@ -981,7 +2256,7 @@ class Client:
         """
 
         # get nt resposne
-        nt_readers = self.get_elements("Lector").get('items')
+        nt_readers = self.get_elements("Lector", cache=True).get('items')
 
         # parse response to list
         readers = []
@@ -1039,3 +2314,599 @@ class Client:
         # save employee
         return self.save_element(**data)
 
+    def import_employees(self, structures, max_workers: int = 4):
+        """
+        Create or update many employees from structures. Update if exists,
+        create if not. Existing nifs are requested once in a paged pass, and
+        the create form, timetypes and readers only once if needed. Saves run
+        in parallel.
+
+        :param structures: iterable of dict like import_employee() structure.
+            Consumed lazily.
+        :param max_workers: (int) Max saves running at same time.
+
+        :return: generator of (structure, response) tuples in order. The
+            response is the exception raised if the employee couldn't be saved.
+        :rtype: generator
+        """
+
+        # nif: id of all existing employees, employees without nif ignored
+        ids = {}
+        duplicated = set()
+        query = Query(fields=["id", "nif"])
+        for employee in self.iter_elements("Persona", query, page_size=500):
+            nif = employee.get('nif')
+            if not nif:
+                continue
+            if nif in ids:
+                duplicated.add(nif)
+            ids[nif] = employee.get('id')
+
+        # nifs created in this import without id in the response
+        created = set()
+
+        # structures of the same nif are saved one after other
+        nif_locks = {}
+        nif_locks_lock = threading.Lock()
+
+        # create form requested on first creation
+        template = {}
+        template_lock = threading.Lock()
+
+        def get_template():
+            with template_lock:
+                if not template:
+                    template.update(self.get_create_form(container="Persona"))
+                    template["TimeTypesEmployee"] = self.get_timetypes_ids()
+                    template["Readers"] = self.get_readers_ids()
+
+            return copy.deepcopy(template)
+
+        def get_created_id(response):
+            # id of the new element, if nettime returns it
+            for item in response if isinstance(response, list) else []:
+                if isinstance(item, dict):
+                    _id = (item.get('dataObject') or {}).get('id')
+                    if _id:
+                        return _id
+
+        def save_nif(structure: dict, nif: str):
+            # employee structure
+            data = {"container": "Persona"}
+
+            # safety only
+            if nif in duplicated:
+                raise ValueError("Más de un empleado con el mismo DNI.")
+
+            if nif in created:
+                raise ValueError("DNI repetido en la importación.")
+
+            if nif in ids:
+                # update employee
+                data["elements"] = [ids.get(nif)]
+                dataObj = {}
+            else:
+                # create form with all timetypes and readers
+                dataObj = get_template()
+
+            dataObj.update(structure)
+            data["dataObj"] = dataObj
+            response = self.save_element(**data)
+
+            # next structures of nif update the new employee
+            if nif and nif not in ids:
+                _id = get_created_id(response)
+                if _id:
+                    ids[nif] = _id
+                else:
+                    created.add(nif)
+
+            return response
+
+        def save(structure: dict):
+            nif = structure.get("nif")
+
+            try:
+                # employees without nif are always created
+                if not nif:
+                    return structure, save_nif(structure, None)
+
+                with nif_locks_lock:
+                    nif_lock = nif_locks.setdefault(nif, threading.Lock())
+
+                with nif_lock:
+                    return structure, save_nif(structure, nif)
+
+            except Exception as error:
+                return structure, error
+
+        return bounded_map(save, structures, max_workers=max_workers)
+
+
+class AsyncClient:
+
+    def __init__(self, url: str, username: str, pwd: str, \
+            max_concurrency: int = 20, *args, **kwargs):
+        """
+        Create an asyncio client of nettime app using recived parameters.
+        Requires httpx. Connect it with `await client.connect()` or using
+        `async with AsyncClient(...) as client`.
+
+        :param url: Nettime url. Eg https://server-name:8091/.
+        :param username: Nettime username.
+        :param pwd: Nettime password.
+        :param max_concurrency: (int) Max requests in flight at same time.
+        :param \*\*kwargs: Optional arguments.
+            :Possible cases:
+            'max_connections': Max connections of the pool.
+            'max_keepalive_connections': Max idle connections of the pool.
+            'retry': RetryPolicy -or max attempts- of the requests.
+            'limiter': adaptive concurrency limit of the requests to server,
+            shared with the Client objects of the same host. See more
+            information in the transport.get_limiter() documentation.
+
+        :return: :class:`AsyncClient` object
+        :rtype: AsyncClient
+        """
+
+        if httpx is None:
+            raise ImportError("AsyncClient requiere httpx instalado.")
+
+        self.client_url = urlparse(url)
+        self.username = username
+        self.pwd = b64encode(pwd.encode('utf-8'))
+
+        ### None values
+        self.access_token = None
+        self.headers = None
+        self.settings = None
+        self.user_rol = None
+
+        # semaphore and lock are bound to the running loop on first use
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+        self._connect_lock = None
+        self._lock_owner = None
+
+        # bounded retries of rejected requests, see RetryPolicy
+        self.retry = self.get_retry_policy(kwargs.get("retry", 3))
+
+        # adaptive concurrency limit, inside the semaphore of the client
+        self.limiter = transport.get_limiter(kwargs.get("limiter", None), url)
+
+        # pooled session reused by all requests of the client
+        limits = httpx.Limits(
+            max_connections=kwargs.get("max_connections", max_concurrency),
+            max_keepalive_connections=kwargs.get(
+                "max_keepalive_connections", max_concurrency),
+        )
+        self.session = httpx.AsyncClient(limits=limits)
+
+    def __str__(self):
+        return '{}{} en {}'.format(
+            f'{self.access_token} para ' if self.access_token else '',
+            self.username,
+            self.client_url.geturl()
+        )
+
+    def __repr__(self):
+        return "{}(url='{}', username='{}', pwd='{}')".format(
+            self.__class__.__name__,
+            self.client_url.geturl(),
+            self.username,
+            b64decode(self.pwd).decode('utf-8'),
+        )
+
+    async def __aenter__(self, *args, **kwargs):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *args, **kwargs):
+        return await self.close()
+
+    @property
+    def is_connected(self):
+        """ Informs if client has headers and access_token. """
+
+        return bool(self.headers) and bool(self.access_token)
+
+    @property
+    def semaphore(self):
+        """ Semaphore that limits the requests in flight. """
+
+        if not self._semaphore:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        return self._semaphore
+
+    @property
+    def connect_lock(self):
+        """ Lock of the coroutines that reconnect the client. """
+
+        if not self._connect_lock:
+            self._connect_lock = asyncio.Lock()
+
+        return self._connect_lock
+
+    def get_retry_policy(self, retry):
+        """ Return the RetryPolicy of the client, see Client. """
+
+        if isinstance(retry, RetryPolicy):
+            return retry
+
+        # httpx errors instead of requests errors
+        return RetryPolicy(
+            attempts=retry or 1,
+            idempotent_posts=('/api/data/cube',),
+            errors=(httpx.TimeoutException, httpx.NetworkError),
+            connect_errors=(httpx.ConnectError, httpx.ConnectTimeout)
+        )
+
+    async def connect(self):
+        """ Connect the client to set access_token and headers values. """
+
+        if self.is_connected:
+            return
+
+        async with self.connect_lock:
+            if not self.is_connected:
+                self._lock_owner = asyncio.current_task()
+                try:
+                    await self.open_session()
+                finally:
+                    self._lock_owner = None
+
+    async def open_session(self):
+        """ Login and set access_token, headers and settings values. """
+
+        # url and data prepare
+        url = urljoin(self.client_url.geturl(), '/api/login')
+        data = {
+            "username": self.username,
+            "pwd": b64decode(self.pwd).decode('utf-8'),
+        }
+        response = await self.session.post(url, data=data)
+
+        if response.status_code not in range(200, 300):
+            raise ConnectionError(response.text)
+
+        json_data = codec.decode(response)
+
+        if not json_data.get("ok"):
+            raise ConnectionError(json_data.get("message"))
+
+        self.access_token = json_data.get("access_token")
+        self.headers = self.get_headers()
+        self.settings = await self.get_settings()
+        self.user_rol = self.settings.get('rol', None)
+
+    async def reconnect(self, token: str = None):
+        """
+        Reconnect client replacing headers and access_token. If token is the
+        expired access_token and other coroutine has replaced it already, the
+        new one is used instead of login again.
+        """
+
+        # session rejected again while this coroutine connects
+        if self._lock_owner is asyncio.current_task():
+            raise ConnectionError("Sesión rechazada luego de reconectar.")
+
+        async with self.connect_lock:
+            # reconnected by other coroutine
+            if token and self.is_connected and self.access_token != token:
+                return
+
+            self._lock_owner = asyncio.current_task()
+            try:
+                await self.open_session()
+            finally:
+                self._lock_owner = None
+
+    async def disconnect(self):
+        """ Disconnect a client to clean the access_token. """
+
+        if not self.is_connected:
+            return
+
+        # disconnect ...
+        await self.post(path='/api/logout')
+
+        # reset values
+        self.access_token = None
+        self.headers = None
+
+    async def close(self):
+        """ Disconnect the client and release the pooled connections. """
+
+        await self.disconnect()
+        await self.session.aclose()
+
+    def get_headers(self):
+        """ Return headers for a specific conection """
+
+        if not self.access_token:
+            raise ConnectionError("El cliente esta desconectado.")
+
+        return {
+            "DNT": "1",
+            "Content-Type": "application/json;charset=UTF-8",
+            "Accept-Encoding": "gzip,deflate",
+            "Cookie": f"sessionID={self.access_token}; i18next=es",
+        }
+
+    async def send(self, method: str, **query):
+        """
+        Sends a request with the session, inside a slot of the limiter if the
+        requests are limited.
+
+        :param method: Method for the new :class:`Request` object.
+        :param \*\*query: Arguments that ``httpx.AsyncClient.request`` takes.
+        :return: :class:`httpx.Response` object
+        :rtype: httpx.Response
+        """
+
+        if not self.limiter:
+            return await self.session.request(method, **query)
+
+        slot = await self.limiter.acquire_async()
+        latency, error = None, False
+        start = time.perf_counter()
+
+        try:
+            response = await self.session.request(method, **query)
+            latency = time.perf_counter() - start
+            error = response.status_code == 429 or \
+                response.status_code >= 500
+            return response
+        except httpx.TransportError:
+            # timeouts and connection errors
+            latency, error = time.perf_counter() - start, True
+            raise
+        finally:
+            await self.limiter.release_async(slot, latency, error)
+
+    async def request(self, method: str, path: str, idempotent: bool = None, \
+            **query):
+        """
+        Sends a request inside the semaphore with the retry policy of the
+        client. On 401 the client is reconnected -once for all coroutines-
+        and the request is sent again with the new session.
+
+        :param method: Method for the new :class:`Request` object.
+        :param path: path to add to URL for the new :class:`Request` object.
+        :param idempotent: (bool) Override the idempotency rules of the
+            retry policy.
+        :param \*\*query: Arguments that ``httpx.AsyncClient.request`` takes.
+        :return: :class:`httpx.Response` object
+        :rtype: httpx.Response
+        """
+
+        backoff = self.retry.get_backoff()
+        attempt = 0
+
+        while True:
+            attempt += 1
+
+            # session used by this attempt
+            token = self.access_token
+            try:
+                async with self.semaphore:
+                    response = await self.send(
+                        method,
+                        url=urljoin(self.client_url.geturl(), path),
+                        headers=self.headers,
+                        **query
+                    )
+            except httpx.TransportError as error:
+                delay = self.retry.next_delay(attempt, backoff, method, \
+                    path, error=error, idempotent=idempotent)
+                if delay is None:
+                    raise
+            else:
+                delay = self.retry.next_delay(attempt, backoff, method, \
+                    path, response=response, idempotent=idempotent)
+                if delay is None:
+                    return response
+
+                if response.status_code == 401:
+                    await self.reconnect(token)
+
+            await asyncio.sleep(delay)
+
+    async def get(self, path: str, params: dict = None, **kwargs):
+        """
+        Sends a GET request to nettime url.
+
+        :param path: path to add to URL for the new :class:`Request` object.
+        :param params: (optional) Dictionary to send in the query string.
+        :param \*\*kwargs: Optional arguments. 'timeout' in seconds.
+        :return: json object
+        :rtype: json
+        """
+
+        if not self.is_connected:
+            raise ConnectionError("Cliente desconectado. Utilice connect().")
+
+        # consulting nettime
+        response = await self.request(
+            'GET', path,
+            idempotent=kwargs.get("idempotent", None),
+            params=params,
+            timeout=kwargs.get("timeout", 10)
+        )
+
+        # raise if was an error
+        if response.status_code not in range(200, 300):
+            raise ConnectionError(response.text)
+
+        # to json
+        return codec.decode(response)
+
+    async def post(self, path, data=None, json=None, **kwargs):
+        """
+        Sends a POST request to nettime url.
+
+        :param path: path to add to URL for the new :class:`Request` object.
+        :param data: (optional) Dictionary to send in the body.
+        :param json: (optional) json data to send in the body.
+        :param \*\*kwargs: Optional arguments. 'timeout' in seconds, polling
+            arguments of get_task_response() and 'task_response': False to
+            get the taskId of an async task instead of its response.
+        :return: json object
+        :rtype: json
+        """
+
+        # wait active conection
+        if not self.is_connected:
+            raise ConnectionError("Cliente desconectado. Utilice connect().")
+
+        # json body encoded with the codec in use
+        content = None
+        if json is not None and data is None:
+            content, json = codec.dumps(json), None
+
+        # consulting nettime
+        response = await self.request(
+            'POST', path,
+            idempotent=kwargs.get("idempotent", None),
+            content=content,
+            data=data,
+            json=json,
+            timeout=kwargs.get("timeout", 10)
+        )
+
+        # raise if was an error
+        if response.status_code not in range(200, 300):
+            raise ConnectionError(response.status_code, response.text)
+
+        # to json -> json
+        json_response = codec.decode(response)
+
+        # get task results if is generated
+        if kwargs.get("task_response", True) and \
+                isinstance(json_response, dict) and \
+                json_response.get('taskId', None):
+            json_response = await self.get_task_response(
+                json_response.get('taskId'), **kwargs)
+
+        # return json response
+        return json_response
+
+    async def get_settings(self):
+        """ Get settings of netTime Server. """
+
+        return await self.get(path='/api/settings')
+
+    async def get_elements(self, container: str, query: Query = None, \
+            **kwargs):
+        """
+        Get elements of an specific container for general propose.
+
+        :param container: (str) Name of nettime container.
+        :param query: (Query) Fields you want to get. Default id and name.
+        :param \*\*kwargs: Optional arguments of Client.get_elements().
+
+        :return: json object
+        :rtype: json
+        """
+
+        if query is None:
+            query = Query(["id", "name"])
+
+        # prepare task parameters
+        params = {
+            "pageStartIndex": kwargs.get("pageStartIndex", 0),
+            "pageSize": kwargs.get("pageSize", 50),
+            "search": kwargs.get("search", ""),
+            "order": kwargs.get("order", ""),
+            "desc": kwargs.get("desc", ""),
+            "container": container,
+            "query": query.prepare()
+        }
+
+        # request.get -> json
+        json_response = await self.get(
+            path='/api/container/elements', params=params)
+
+        # get task results
+        if json_response.get('taskId', None):
+            json_response = await self.get_task_response(
+                json_response.get('taskId'), **kwargs)
+
+        return json_response
+
+    async def get_task_status(self, task: int):
+        """ Get status of an async task. """
+
+        return await self.get(
+            path='/api/async/status', params={"taskid": task})
+
+    async def get_async_response(self, task: int):
+        """ Get response of a completed async task. """
+
+        return await self.get(
+            path='/api/async/response', params={"taskid": task})
+
+    async def get_task_response(self, task: int, **kwargs):
+        """
+        Return the result of a async task. The status is polled without
+        blocking the loop, with the polling arguments of AsyncTask.
+        Cancel the awaiting coroutine to stop polling.
+        """
+
+        backoff = Backoff(**kwargs)
+        callback = kwargs.get("callback", None)
+
+        while True:
+            task_status = await self.get_task_status(task)
+            if callback:
+                callback(task, task_status)
+
+            if task_status.get("completed", False):
+                break
+
+            await asyncio.sleep(backoff.next())
+
+        return await self.get_async_response(task)
+
+    async def get_results(self, employee: int, _from: str = None, \
+            to: str = None, **kwargs):
+        """ Get results of day for a employee. Default today. """
+
+        today = datetime.date.today().isoformat()
+
+        # prepare task parameters
+        params = {
+            'idemp': employee,
+            'from': _from or today,
+            'to': to or today,
+        }
+
+        # generate async task
+        async_task = await self.get(path='/api/results', params=params)
+
+        # get task results
+        return await self.get_task_response(
+            async_task.get('taskId'), **kwargs)
+
+    async def get_cube_results(self, dimensions: list, dateIni: str, \
+            dateEnd: str, interFilters: list = [], filters: list = [], \
+            ids: list = [], **kwargs):
+        """
+        Gets nettime results using the "Results Query" window engine. See
+        more information in the Client.get_cube_results() documentation.
+        """
+
+        # prepare task parameters
+        json_data = {
+            "container": "Persona",
+            "dateIni": dateIni,
+            "dateEnd": dateEnd,
+            "ids": ids,
+            "filters": filters,
+            "dimensions": dimensions,
+            "interFilters": interFilters,
+        }
+
+        # post and return response
+        return await self.post(path='/api/data/cube', json=json_data, **kwargs)
@@ -1,6 +1,6 @@
 from urllib.parse import urlparse, urlencode, urljoin, quote
 from base64 import b64encode, b64decode
-import requests
+from .transport import Transport
 import datetime
 # import re
 # import math
@@ -17,6 +17,9 @@ class Client:
         self.client_url = urlparse(url)
         self.apikey = b64encode(apikey.encode('utf-8'))
 
+        # pooled session with precomputed headers, see Transport
+        self.transport = Transport(headers=self.headers, **kwargs)
+
     def __str__(self):
         return f'Client for {self.client_fullpath}'
 
@@ -31,7 +34,7 @@ class Client:
         return self
 
     def __exit__(self, *args, **kwargs):
-        return
+        return self.transport.close()
 
     @property
     def client_fullpath(self):
@@ -61,32 +64,13 @@ class Client:
         :rtype: dict
         """
 
-        # query prepare
-        query = {
-            "url": urljoin(self.client_fullpath, path),
-            "params": urlencode(params, quote_via=quote),
-            "headers": self.headers,
-            "timeout": kwargs.get("timeout", 20),
-            "stream": kwargs.get("stream", False)
-        }
-
-        # consulting nettime
-        response = requests.get(**query)
-
-        # raise if was an error
-        if response.status_code not in range(200, 300):
-            raise ConnectionError(f'{response.status_code}: {response.text}')
-
-        # to json -> json
-        try:
-            # if request is stream type, return all response
-            if kwargs.get("stream"):
-                return response
-
-            # return json response
-            return response.json()
-        except:
-            return {}
+        # request.get -> json
+        return self.transport.get(
+            url=urljoin(self.client_fullpath, path),
+            params=urlencode(params, quote_via=quote),
+            timeout=kwargs.get("timeout", None),
+            stream=kwargs.get("stream", False)
+        )
 
     def post(self, path, params: dict = None, data: dict = None, \
             json: dict = None, **kwargs):
@@ -104,28 +88,14 @@ class Client:
         :rtype: dict
         """
 
-        # query prepare
-        query = {
-            "url": urljoin(self.client_fullpath, path),
-            "params": urlencode(params, quote_via=quote),
-            "data": data,
-            "json": json,
-            "headers": self.headers,
-            "timeout": kwargs.get("timeout", 20),
-        }
-
-        # consulting nettime
-        response = requests.post(**query)
-
-        # raise if was an error
-        if response.status_code not in range(200, 300):
-            raise ConnectionError(response.text)
-
-        # to json -> json
-        try:
-            return response.json()
-        except:
-            return {}
+        # request.post -> json
+        return self.transport.post(
+            url=urljoin(self.client_fullpath, path),
+            params=urlencode(params, quote_via=quote),
+            data=data,
+            json=json,
+            timeout=kwargs.get("timeout", None)
+        )
 
     def get_clockings(self, _type: str, _from: datetime.datetime, \
             _to: datetime.datetime, fromHistory: bool = False, \
@@ -1,14 +1,39 @@
 import pandas as pd
 import sqlalchemy
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, QueuePool
+from contextlib import contextmanager, nullcontext
 import datetime as dt
+import time
 from secrets import token_hex
 
+# max parameters allowed by SQL Server in a single statement
+MSSQL_MAX_PARAMS = 2100
+
+# max rows allowed by SQL Server in a single INSERT ... VALUES
+MSSQL_MAX_ROWS = 1000
+
 class Client:
 
     def __init__(self, username: str, pwd: str, server: str, database: str, \
             port: int = 1433, driver: str = "mssql+pyodbc", \
-            controller: str = "SQL Server"):
+            controller: str = "SQL Server", pool_size: int = None, \
+            max_overflow: int = 10, pool_timeout: int = 30, \
+            pool_recycle: int = -1, pool_pre_ping: bool = True, \
+            fast_executemany: bool = False):
+        """
+        Create an engine for the SPEC Manager database.
+
+        :param pool_size: (int) Connections kept open in the pool. None -by
+            default- opens and closes a connection for each operation.
+        :param max_overflow: (int) Connections allowed beyond pool_size.
+        :param pool_timeout: (int) Seconds to wait a free connection.
+        :param pool_recycle: (int) Seconds after which a connection is
+            recycled. -1 to never recycle.
+        :param pool_pre_ping: (bool) Test connections before use them.
+        :param fast_executemany: (bool) Send all inserts of the engine in
+            array batches. Only used with the mssql+pyodbc driver. bulk_insert()
+            uses it even if False, see bulk_engine.
+        """
 
         self.engine_params = sqlalchemy.engine.url.URL(
             drivername=driver,
@@ -20,11 +45,36 @@ class Client:
             query={'driver': controller}
         )
 
+        # connection per operation by default
+        pool_params = {"poolclass": NullPool}
+        if pool_size:
+            pool_params = {
+                "poolclass": QueuePool,
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_timeout": pool_timeout,
+                "pool_recycle": pool_recycle,
+                "pool_pre_ping": pool_pre_ping,
+            }
+
+        # only supported by pyodbc dialect
+        self.supports_fast_executemany = driver.startswith("mssql+pyodbc")
+        self.fast_executemany = fast_executemany and \
+            self.supports_fast_executemany
+        self.pool_params = pool_params
+
+        engine_params = dict(pool_params)
+        if self.fast_executemany:
+            engine_params["fast_executemany"] = True
+
         self.engine = sqlalchemy.create_engine(
             self.engine_params,
-            poolclass=NullPool
+            **engine_params
         )
 
+        # engine of bulk_insert(), created on demand
+        self._bulk_engine = None
+
     def __enter__(self, *args, **kwargs):
         return self
 
@@ -33,19 +83,77 @@ class Client:
 
 
     def dispose(self):
+        if self._bulk_engine is not None:
+            self._bulk_engine.dispose()
+
         return self.engine.dispose()
 
+    @property
+    def bulk_engine(self):
+        """
+        Engine of bulk_insert(). Same as engine, but with fast_executemany
+        enabled if the driver supports it, so only bulk inserts use it.
+        """
+
+        if self.fast_executemany or not self.supports_fast_executemany:
+            return self.engine
+
+        if self._bulk_engine is None:
+            self._bulk_engine = sqlalchemy.create_engine(
+                self.engine_params,
+                fast_executemany=True,
+                **self.pool_params
+            )
+
+        return self._bulk_engine
+
     @property
     def table_names(self):
         return self.engine.table_names()
 
-    def query_execute(self, query: str, to_records: bool = False, **kwargs):
+    @contextmanager
+    def connect(self):
+        """
+        Context manager that takes a connection from the pool and returns it
+        at exit. Pass it as 'con' to run many operations with it.
+        """
+
+        connection = self.engine.connect()
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager that yields a connection with an open transaction.
+        Commit at exit or rollback if an exception is raised.
+        """
+
+        with self.engine.begin() as connection:
+            yield connection
+
+    def query_execute(self, query: str, to_records: bool = False, \
+            chunksize: int = None, con = None, **kwargs):
         """
         Open/close connection and Execute a custom query and return result.
+        If chunksize, return a generator of chunks. See iter_query().
+        Use con to execute with a connection of connect() or transaction().
         """
 
+        # streaming mode
+        if chunksize:
+            return self.iter_query(
+                query=query,
+                chunksize=chunksize,
+                to_records=to_records,
+                con=con,
+                **kwargs
+            )
+
         # create connection and execute query
-        connection = self.engine.execute(query, **kwargs)
+        connection = (con or self.engine).execute(query, **kwargs)
 
         # if query doesn't return rows, return bool
         if not connection.returns_rows:
@@ -54,24 +162,73 @@ class Client:
             # return affected rows
             return connection.rowcount
         
-        # create dataframe with result
-        df = pd.DataFrame(connection.fetchall(), columns=connection.keys())
-        
+        columns = list(connection.keys())
+        rows = connection.fetchall()
+
         # close connection --safety--
         connection.close()
 
-        # return json format
+        # return json format without an intermediate dataframe
         if to_records:
-            return df.to_dict('records')
+            return [dict(zip(columns, row)) for row in rows]
 
         # return pandas DataFrame
-        return df
+        return pd.DataFrame(rows, columns=columns)
+
+    def iter_query(self, query: str, chunksize: int = 10000, \
+            to_records: bool = False, con = None, **kwargs):
+        """
+        Execute a query with a server side cursor and yield the result in
+        chunks of chunksize rows, so only one chunk is kept in memory.
+
+        :param query: (str) Query to execute. Must return rows.
+        :param chunksize: (int) Max rows of each chunk.
+        :param to_records: (bool) True to yield list of dicts instead of
+            pandas DataFrame.
+        :param con: (optional) Connection of connect() or transaction().
+        :param \*\*kwargs: Optional parameters of the query.
+
+        :return: generator of :class:`pandas.DataFrame` or list
+        :rtype: generator
+        """
+
+        with (nullcontext(con) if con else self.connect()) as connection:
+            # rows are fetched from server as they are consumed
+            result = connection.execution_options(stream_results=True) \
+                .execute(query, **kwargs)
+
+            columns = list(result.keys())
+            while True:
+                rows = result.fetchmany(chunksize)
+                if not rows:
+                    break
+
+                if to_records:
+                    yield [dict(zip(columns, row)) for row in rows]
+                else:
+                    yield pd.DataFrame(rows, columns=columns)
 
-    def read_sql_query(self, query: str, to_records: bool = False):
-        """ Execute query with active engine and return pandas dataframe. """
+            result.close()
+
+    def read_sql_query(self, query: str, to_records: bool = False, \
+            chunksize: int = None, con = None):
+        """
+        Execute query with active engine and return pandas dataframe.
+        If chunksize, return a generator of chunks. See iter_query().
+        Use con to execute with a connection of connect() or transaction().
+        """
+
+        # streaming mode
+        if chunksize:
+            return self.iter_query(
+                query=query,
+                chunksize=chunksize,
+                to_records=to_records,
+                con=con
+            )
 
         # query execute
-        df = pd.read_sql_query(query, self.engine)
+        df = pd.read_sql_query(query, con or self.engine)
 
         if to_records:
             # return json format
@@ -82,8 +239,11 @@ class Client:
     def insert_values(self, df: pd.DataFrame, table: str, schema: str = None, \
             if_exists: str = 'append', index: bool = False, \
             index_label: str = None, chunksize: int = None, \
-            method: str = None, from_records: bool = False):
-        """ Insert a dataframe in database with recived data. """
+            method: str = None, from_records: bool = False, con = None):
+        """
+        Insert a dataframe in database with recived data.
+        Use con to insert with a connection of connect() or transaction().
+        """
         
         if from_records and not isinstance(df, pd.DataFrame):
             # create pandas dataframe
@@ -92,7 +252,7 @@ class Client:
         # to sql
         df.to_sql(
             name=table,
-            con=self.engine,
+            con=con or self.engine,
             schema=schema,
             if_exists=if_exists,
             index=index,
@@ -104,6 +264,59 @@ class Client:
         # return true for general propose
         return True
 
+    def bulk_insert(self, df: pd.DataFrame, table: str, schema: str = None, \
+            if_exists: str = 'append', index: bool = False, \
+            chunksize: int = None, multi: bool = None, \
+            from_records: bool = False, con = None):
+        """
+        Insert a dataframe in database as fast as possible and return stats.
+        Use fast_executemany of bulk_engine if the driver supports it, else
+        multi-row VALUES statements with chunks sized under the parameter and
+        row limits of SQL Server.
+
+        :param multi: (bool) True to force multi-row VALUES statements.
+            Default is True only if the driver hasn't fast_executemany.
+
+        :return: :class:`dict` object with 'rows', 'seconds' and 'rows_per_sec'
+        :rtype: dict
+        """
+
+        if from_records and not isinstance(df, pd.DataFrame):
+            # create pandas dataframe
+            df = pd.DataFrame.from_records(df)
+
+        if multi is None:
+            multi = not self.supports_fast_executemany
+
+        method = None
+        if multi:
+            method = 'multi'
+
+            # each row uses a parameter per column
+            columns = len(df.columns) + (1 if index else 0)
+            max_rows = max((MSSQL_MAX_PARAMS - 1) // max(columns, 1), 1)
+            max_rows = min(max_rows, MSSQL_MAX_ROWS)
+            chunksize = min(chunksize or max_rows, max_rows)
+
+        start = time.perf_counter()
+        self.insert_values(
+            df=df,
+            table=table,
+            schema=schema,
+            if_exists=if_exists,
+            index=index,
+            chunksize=chunksize,
+            method=method,
+            con=con or self.bulk_engine
+        )
+        seconds = time.perf_counter() - start
+
+        return {
+            "rows": len(df),
+            "seconds": seconds,
+            "rows_per_sec": len(df) / seconds if seconds else None,
+        }
+
     def run_import_lips(self, table: str, lips_name: str, _hash: str = None, \
             source: str = 'spec-utils', downconf_table: str = 'AR_DOWNCONF', \
             **kwargs):
@@ -146,33 +359,69 @@ class Client:
 
     def import_employees(self, employees: pd.DataFrame, \
             table: str = "AR_IMP_PERSONAL", lips_name: str = "IMP_PERSONAL", \
-            ** kwargs):
-        """ Insert a dataframe of employees in database. """
+            bulk: bool = True, ** kwargs):
+        """
+        Insert a dataframe of employees in database. Use bulk_insert() by
+        default, set bulk to False to use insert_values().
+
+        :return: :class:`dict` object with 'rows', 'seconds' and 'rows_per_sec'
+            of the insert.
+        :rtype: dict
+        """
 
         # insert dataframe
-        insert = self.insert_values(
-            df=employees,
-            table=table,
-        )
+        if bulk:
+            insert = self.bulk_insert(df=employees, table=table)
+        else:
+            start = time.perf_counter()
+            self.insert_values(df=employees, table=table)
+            seconds = time.perf_counter() - start
+            insert = {
+                "rows": len(employees),
+                "seconds": seconds,
+                "rows_per_sec": len(employees) / seconds if seconds else None,
+            }
 
         # if error
         if not insert:
             raise RuntimeError("Error inserting employees in database.")
         
         # force import inserting new line in ar_down_conf
-        return self.run_import_lips(
+        self.run_import_lips(
             table=table,
             lips_name=lips_name,
             **kwargs
         )
+
+        return insert
     
     def sync_results(self, from_table: str, marc_col: str, \
-            auto_update: bool = True, **kwargs):
+            auto_update: bool = True, atomic: bool = False, \
+            batch_size: int = 1000, key_col: str = None, **kwargs):
         """
         Get rows from table with marc_col = 0 (False).
         After of get rows, update marc_col to 1 (True).
+        If atomic, rows are claimed and fetched in the same statement. See
+        iter_sync_results().
         """
 
+        if atomic:
+            to_records = kwargs.get('to_records', False)
+            batches = list(self.iter_sync_results(
+                from_table=from_table,
+                marc_col=marc_col,
+                batch_size=batch_size,
+                key_col=key_col,
+                to_records=to_records
+            ))
+
+            # join batches
+            if to_records:
+                return [row for batch in batches for row in batch]
+            if not batches:
+                return pd.DataFrame()
+            return pd.concat(batches, ignore_index=True)
+
         # get rows
         results = self.get_from_table(
             table=from_table,
@@ -188,3 +437,57 @@ class Client:
 
         # return rows
         return results
+
+    def iter_sync_results(self, from_table: str, marc_col: str, \
+            batch_size: int = 1000, key_col: str = None, \
+            to_records: bool = False):
+        """
+        Claim rows from table with marc_col = 0 (False) in batches and yield
+        them. Each batch is updated to marc_col = 1 (True) and returned by the
+        same UPDATE ... OUTPUT statement in its own transaction, so no row is
+        marked without being read. Rows locked by other workers are skipped.
+
+        :param from_table: (str) Table to sync.
+        :param marc_col: (str) Bit column that marks the synced rows.
+        :param batch_size: (int) Max rows claimed by batch.
+        :param key_col: (str) Optional column to claim rows in key order.
+        :param to_records: (bool) True to yield list of dicts instead of
+            pandas DataFrame.
+
+        :return: generator of :class:`pandas.DataFrame` or list
+        :rtype: generator
+        """
+
+        if key_col:
+            # keyset batch: lowest pending keys first
+            query = (
+                f'WITH batch AS (SELECT TOP ({batch_size}) * FROM '
+                f'{from_table} WITH (ROWLOCK, UPDLOCK, READPAST) '
+                f'WHERE {marc_col} = 0 ORDER BY {key_col}) '
+                f'UPDATE batch SET {marc_col} = 1 OUTPUT inserted.*;'
+            )
+        else:
+            query = (
+                f'UPDATE TOP ({batch_size}) {from_table} '
+                f'WITH (ROWLOCK, READPAST) SET {marc_col} = 1 '
+                f'OUTPUT inserted.* WHERE {marc_col} = 0;'
+            )
+
+        while True:
+            # claim and fetch in the same transaction
+            with self.transaction() as connection:
+                result = connection.execute(query)
+                columns = list(result.keys())
+                rows = result.fetchall()
+
+            if not rows:
+                return
+
+            if to_records:
+                yield [dict(zip(columns, row)) for row in rows]
+            else:
+                yield pd.DataFrame(rows, columns=columns)
+
+            # backlog drained
+            if len(rows) < batch_size:
+                return
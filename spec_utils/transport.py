@@ -0,0 +1,1083 @@
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+from random import uniform as r_uniform
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
+from itertools import islice
+from contextlib import contextmanager
+from . import codec
+import threading
+import copy
+import json
+import os
+import asyncio
+import requests
+import sqlite3
+import time
+
+# file locks of SessionStore, only available on posix
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def get_session(pool_connections: int = 10, pool_maxsize: int = 10, \
+        max_retries=0, keep_alive: bool = True, headers: dict = None, \
+        auth: tuple = None):
+    """
+    Create a :class:`requests.Session` with pooled adapters mounted, so the
+    TCP/TLS connections are reused between requests.
+
+    :param pool_connections: (int) Number of connection pools to cache.
+    :param pool_maxsize: (int) Max number of connections saved in pool.
+        Use at least the number of threads sharing the session.
+    :param max_retries: (int or :class:`urllib3.util.Retry`) Retry policy of
+        each connection. Int value retries only at socket level.
+    :param keep_alive: (bool) False to close connection after each request.
+    :param headers: (dict) Headers sent in all requests of the session.
+    :param auth: (tuple) Basic authentication of all requests.
+
+    :return: :class:`requests.Session` object
+    :rtype: requests.Session
+    """
+
+    session = requests.Session()
+
+    # mount the same pooled adapter for both schemes
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    # precomputed once, merged by requests in each request
+    if headers:
+        session.headers.update(headers)
+
+    if auth:
+        session.auth = auth
+
+    # keep-alive is the default of requests
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+
+    return session
+
+
+def bounded_map(func, iterable, max_workers: int = 4):
+    """
+    Like map() but calls run in a pool of max_workers threads. The iterable
+    is consumed lazily, only max_workers calls are pending at same time and
+    results are yielded in order.
+    """
+
+    items = iter(iterable)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # sliding window of pending calls
+        futures = deque(
+            executor.submit(func, item) for item in islice(items, max_workers)
+        )
+
+        while futures:
+            result = futures.popleft().result()
+
+            # keep the window full
+            for item in islice(items, 1):
+                futures.append(executor.submit(func, item))
+
+            yield result
+
+
+class Backoff:
+
+    def __init__(self, **kwargs):
+        """
+        Sleep intervals that grow exponentially with random jitter, limited
+        by an overall deadline.
+
+        :param \*\*kwargs: Optional arguments.
+            :Possible cases:
+            'deadline': Max seconds of all sleeps. None never expires.
+            'interval': Seconds of the first sleep.
+            'max_interval': Max seconds of a sleep.
+            'backoff': Factor applied to the interval after each sleep.
+            'jitter': Fraction of the interval added randomly to the sleep.
+
+        :return: :class:`Backoff` object
+        :rtype: Backoff
+        """
+
+        self.deadline = kwargs.get("deadline", None)
+        self.interval = kwargs.get("interval", 0.1)
+        self.max_interval = kwargs.get("max_interval", 2.0)
+        self.backoff = kwargs.get("backoff", 1.5)
+        self.jitter = kwargs.get("jitter", 0.1)
+
+        self.expires = None
+        if self.deadline is not None:
+            self.expires = time.monotonic() + self.deadline
+
+        self.delay = self.interval
+
+    def reset(self):
+        """ Start again from the first interval. Deadline is not changed. """
+
+        self.delay = self.interval
+
+    def next(self):
+        """
+        Return the seconds to sleep before the next attempt, never beyond the
+        deadline. Raise TimeoutError if the deadline has expired.
+        """
+
+        sleep = self.delay + r_uniform(0, self.delay * self.jitter)
+        if self.expires is not None:
+            remaining = self.expires - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"Tiempo de espera agotado ({self.deadline}s).")
+            sleep = min(sleep, remaining)
+
+        self.delay = min(self.delay * self.backoff, self.max_interval)
+        return sleep
+
+
+# rejected requests that can be sent again, 401 after reconnect
+RETRY_STATUSES = (401, 429, 502, 503)
+
+
+class RetryPolicy:
+
+    def __init__(self, **kwargs):
+        """
+        Bounded retries of the requests of a client. A request is sent again
+        when its status is in statuses or it fails by timeout or connection,
+        waiting with exponential backoff or the Retry-After header. POST
+        requests are retried only if nettime rejected them -401, 429- or if
+        they are idempotent, because others may have been applied.
+
+        :param \*\*kwargs: Optional arguments:
+            'attempts': max requests sent, including the first. 3 by default.
+            'statuses': status codes to retry. RETRY_STATUSES by default.
+            'idempotent_posts': paths -or prefixes- of the POST requests safe
+            to send twice. E.g. ('/api/data/cube',).
+            'errors': exceptions to retry on idempotent requests.
+            'connect_errors': exceptions of requests never sent, retried on
+            any method.
+            'max_retry_after': max seconds to wait a Retry-After header. The
+            request is not retried if the server asks to wait longer. 30 by
+            default.
+            The Backoff arguments -interval, max_interval, backoff, jitter-.
+
+        :return: :class:`RetryPolicy` object
+        :rtype: RetryPolicy
+        """
+
+        self.attempts = kwargs.get("attempts", 3)
+        self.statuses = set(kwargs.get("statuses", RETRY_STATUSES))
+        self.idempotent_posts = tuple(kwargs.get("idempotent_posts", ()))
+        self.errors = kwargs.get("errors", (
+            requests.Timeout,
+            requests.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+        ))
+        self.connect_errors = kwargs.get(
+            "connect_errors", (requests.ConnectTimeout,))
+        self.max_retry_after = kwargs.get("max_retry_after", 30.0)
+
+        self.backoff = {
+            "interval": kwargs.get("interval", 0.2),
+            "max_interval": kwargs.get("max_interval", 5.0),
+            "backoff": kwargs.get("backoff", 2.0),
+            "jitter": kwargs.get("jitter", 0.1),
+        }
+
+    def get_backoff(self):
+        """ New Backoff for the attempts of a request. """
+
+        return Backoff(**self.backoff)
+
+    def is_idempotent(self, method: str, path: str, idempotent: bool = None):
+        """
+        Informs if a request can be sent twice. idempotent overrides the
+        rules of the policy.
+        """
+
+        if idempotent is not None:
+            return idempotent
+
+        if method.upper() != 'POST':
+            return True
+
+        return (path or '').startswith(self.idempotent_posts) \
+            if self.idempotent_posts else False
+
+    def next_delay(self, attempt: int, backoff: Backoff, method: str, \
+            path: str, response=None, error: Exception = None, \
+            idempotent: bool = None):
+        """
+        Return the seconds to wait before sending the request again, or None
+        if it must not be retried.
+
+        :param attempt: (int) Number of the attempt finished, from 1.
+        :param backoff: :class:`Backoff` of the request.
+        :param method: Method of the request.
+        :param path: Path of the request, used by idempotency rules.
+        :param response: Response received, if any.
+        :param error: Exception raised by the request, if any.
+        :param idempotent: (bool) Override the idempotency rules.
+        :return: :class:`float` object or None
+        :rtype: float
+        """
+
+        if attempt >= self.attempts:
+            return None
+
+        if error is not None:
+            if isinstance(error, self.connect_errors):
+                return backoff.next()
+
+            if isinstance(error, self.errors) and \
+                    self.is_idempotent(method, path, idempotent):
+                return backoff.next()
+
+            return None
+
+        status = response.status_code
+        if status not in self.statuses:
+            return None
+
+        # session reconnected by the client, send again now
+        if status == 401:
+            return 0.0
+
+        # rejected by the server, not applied
+        if status != 429 and not self.is_idempotent(method, path, idempotent):
+            return None
+
+        # wait what the server says if it does, unless it's too long to
+        # block the caller
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            delay = float(retry_after)
+            return delay if delay <= self.max_retry_after else None
+
+        return backoff.next()
+
+    def call(self, send, method: str, path: str, idempotent: bool = None, \
+            on_unauthorized=None):
+        """
+        Call send() -a request- until its response is not retryable or the
+        attempts are exhausted, and return the last response.
+
+        :param send: Callable that returns a :class:`requests.Response`.
+        :param method: Method of the request.
+        :param path: Path of the request, used by idempotency rules.
+        :param idempotent: (bool) Override the idempotency rules.
+        :param on_unauthorized: Callable to reconnect the client on 401. 401
+            is not retried without it.
+        :return: :class:`requests.Response` object
+        :rtype: requests.Response
+        """
+
+        backoff = self.get_backoff()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            try:
+                response = send()
+            except requests.RequestException as error:
+                delay = self.next_delay(attempt, backoff, method, path, \
+                    error=error, idempotent=idempotent)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code == 401 and not on_unauthorized:
+                    return response
+
+                delay = self.next_delay(attempt, backoff, method, path, \
+                    response=response, idempotent=idempotent)
+                if delay is None:
+                    return response
+
+                if response.status_code == 401:
+                    on_unauthorized()
+
+            time.sleep(delay)
+
+
+class Metrics:
+
+    def __init__(self):
+        """
+        Metrics hook for Transport objects. Counts requests, errors, status
+        codes and elapsed time of the requests.
+
+        :return: :class:`Metrics` object
+        :rtype: Metrics
+        """
+
+        self.requests = 0
+        self.errors = 0
+        self.elapsed = 0.0
+        self.status = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, method: str, url: str, status: int, elapsed: float, \
+            error: Exception = None):
+        """ Record a request of a Transport. """
+
+        with self._lock:
+            self.requests += 1
+            self.elapsed += elapsed
+            self.status[status] = self.status.get(status, 0) + 1
+
+            if error or status not in range(200, 300):
+                self.errors += 1
+
+    @property
+    def mean_elapsed(self):
+        """ Mean seconds of the requests. """
+
+        return self.elapsed / self.requests if self.requests else 0.0
+
+
+class AdaptiveLimiter:
+
+    # limiters shared by the clients of each host, see for_host()
+    _hosts = {}
+    _hosts_lock = threading.Lock()
+
+    def __init__(self, host: str = None, path: str = None, **kwargs):
+        """
+        AIMD concurrency limiter of the requests to a server. The limit of
+        requests in flight grows by one for each window of successful
+        requests and is reduced by half on errors -429, 5xx or timeouts- or
+        when latency is greater than tolerance times the usual latency.
+
+        :param host: (str) Server of the requests, used as key of the budget.
+        :param path: (str) Optional sqlite file to share the budget with the
+            limiters of other processes of the same machine.
+        :param \*\*kwargs: Optional arguments:
+            'initial', 'min_limit' and 'max_limit' of concurrent requests.
+            4, 1 and 64 by default.
+            'decrease': factor applied to the limit on errors. 0.5 by default.
+            'tolerance': factor of the usual latency considered congestion.
+            3.0 by default.
+            'lease': seconds to expire the slots of a dead process. Only used
+            with path. 300 by default.
+
+        :return: :class:`AdaptiveLimiter` object
+        :rtype: AdaptiveLimiter
+        """
+
+        self.host = host
+        self.path = path
+
+        self.min_limit = kwargs.get("min_limit", 1)
+        self.max_limit = kwargs.get("max_limit", 64)
+        self.decrease = kwargs.get("decrease", 0.5)
+        self.tolerance = kwargs.get("tolerance", 3.0)
+        self.lease = kwargs.get("lease", 300)
+        self.limit = float(kwargs.get("initial", 4))
+
+        # stats of the requests
+        self.inflight = 0
+        self.requests = 0
+        self.errors = 0
+        self.latency = None
+        self.baseline = None
+        self._last_decrease = 0.0
+
+        self._cond = threading.Condition()
+
+        if self.path:
+            with self._connect() as con:
+                con.execute('CREATE TABLE IF NOT EXISTS limits \
+                    (host TEXT PRIMARY KEY, lim REAL)')
+                con.execute('CREATE TABLE IF NOT EXISTS slots \
+                    (id INTEGER PRIMARY KEY, host TEXT, expires REAL)')
+
+    @classmethod
+    def for_host(cls, host: str, path: str = None, **kwargs):
+        """ Return the limiter shared by all clients of host. """
+
+        with cls._hosts_lock:
+            limiter = cls._hosts.get((host, path))
+            if limiter is None:
+                limiter = cls(host=host, path=path, **kwargs)
+                cls._hosts[(host, path)] = limiter
+
+        return limiter
+
+    @property
+    def error_rate(self):
+        """ Rate of the requests with errors. """
+
+        return self.errors / self.requests if self.requests else 0.0
+
+    def _connect(self):
+        """ New connection to the sqlite file, in autocommit mode. """
+
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _adjust(self, limit: float, latency: float, error: bool):
+        """ Update stats with a finished request and return the new limit. """
+
+        with self._cond:
+            self.requests += 1
+            self.errors += int(error)
+
+            # fast and slow moving averages of latency
+            if self.latency is None:
+                self.latency = self.baseline = latency
+            self.latency += 0.2 * (latency - self.latency)
+            self.baseline += 0.02 * (latency - self.baseline)
+
+            congested = error or latency > self.tolerance * self.baseline
+
+            # additive increase, one slot per window of requests
+            if not congested:
+                return min(self.max_limit, limit + 1 / limit)
+
+            # multiplicative decrease, once per round trip only
+            now = time.monotonic()
+            if now - self._last_decrease < self.latency:
+                return limit
+
+            self._last_decrease = now
+            return max(self.min_limit, limit * self.decrease)
+
+    def acquire(self):
+        """
+        Wait for a free slot of the limit and take it.
+
+        :return: Id of the slot to release.
+        """
+
+        if self.path:
+            return self._acquire_shared()
+
+        with self._cond:
+            while self.inflight >= int(self.limit):
+                self._cond.wait()
+
+            self.inflight += 1
+
+    def release(self, slot=None, latency: float = None, error: bool = False):
+        """
+        Free a slot taken with acquire(). Limit is adjusted if latency of the
+        request is received.
+        """
+
+        if self.path:
+            return self._release_shared(slot, latency, error)
+
+        with self._cond:
+            self.inflight -= 1
+            if latency is not None:
+                self.limit = self._adjust(self.limit, latency, error)
+            self._cond.notify_all()
+
+    def _try_acquire(self):
+        """ Take a free slot of the limit if there is one. """
+
+        with self._cond:
+            if self.inflight >= int(self.limit):
+                return False
+
+            self.inflight += 1
+            return True
+
+    async def acquire_async(self):
+        """
+        acquire() for coroutines, waits without blocking the event loop.
+
+        :return: Id of the slot to release with release_async().
+        """
+
+        loop = asyncio.get_running_loop()
+
+        # slots are released by threads, other loops and processes too
+        while True:
+            if self.path:
+                slot = await loop.run_in_executor(
+                    None, self._try_acquire_shared)
+                if slot is not None:
+                    return slot
+            elif self._try_acquire():
+                return None
+
+            await asyncio.sleep(max(0.005, min(self.latency or 0.01, 0.1)))
+
+    async def release_async(self, slot=None, latency: float = None, \
+            error: bool = False):
+        """ release() for coroutines, see acquire_async(). """
+
+        if self.path:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._release_shared, slot, latency, error)
+
+        self.release(slot, latency, error)
+
+    def _acquire_shared(self):
+        """ acquire() with the budget of the sqlite file. """
+
+        slot = self._try_acquire_shared()
+        while slot is None:
+            # wait for other processes
+            time.sleep(max(0.01, min(self.latency or 0.05, 1.0)))
+            slot = self._try_acquire_shared()
+
+        return slot
+
+    def _try_acquire_shared(self):
+        """ Take a free slot of the sqlite budget and return its id or None. """
+
+        con = self._connect()
+        try:
+            con.execute('BEGIN IMMEDIATE')
+
+            # slots of dead processes
+            now = time.time()
+            con.execute('DELETE FROM slots WHERE host = ? AND \
+                expires < ?', (self.host, now))
+
+            row = con.execute('SELECT lim FROM limits WHERE host = ?', \
+                (self.host,)).fetchone()
+            if row is None:
+                con.execute('INSERT INTO limits VALUES (?, ?)', \
+                    (self.host, self.limit))
+            else:
+                self.limit = row[0]
+
+            self.inflight = con.execute('SELECT COUNT(*) FROM slots \
+                WHERE host = ?', (self.host,)).fetchone()[0]
+
+            slot = None
+            if self.inflight < int(self.limit):
+                slot = con.execute('INSERT INTO slots (host, expires) \
+                    VALUES (?, ?)', (self.host, now + self.lease)).lastrowid
+
+            con.execute('COMMIT')
+            return slot
+        finally:
+            con.close()
+
+    def _release_shared(self, slot: int, latency: float, error: bool):
+        """ release() with the budget of the sqlite file. """
+
+        con = self._connect()
+        try:
+            con.execute('BEGIN IMMEDIATE')
+            con.execute('DELETE FROM slots WHERE id = ?', (slot,))
+
+            if latency is not None:
+                row = con.execute('SELECT lim FROM limits WHERE host = ?', \
+                    (self.host,)).fetchone()
+                self.limit = self._adjust(
+                    row[0] if row else self.limit, latency, error)
+                con.execute('UPDATE limits SET lim = ? WHERE host = ?', \
+                    (self.limit, self.host))
+
+            con.execute('COMMIT')
+        finally:
+            con.close()
+
+    def call(self, send, *args, **kwargs):
+        """
+        Call send(*args, **kwargs) -a request- inside a slot of the limiter
+        and adjust the limit with its latency and status code.
+
+        :param send: Callable that returns a :class:`requests.Response`.
+        :return: :class:`requests.Response` object
+        :rtype: requests.Response
+        """
+
+        slot = self.acquire()
+        latency, error = None, False
+        start = time.perf_counter()
+
+        try:
+            response = send(*args, **kwargs)
+            latency = time.perf_counter() - start
+            error = response.status_code == 429 or \
+                response.status_code >= 500
+            return response
+        except requests.RequestException:
+            # timeouts and connection errors
+            latency, error = time.perf_counter() - start, True
+            raise
+        finally:
+            self.release(slot, latency, error)
+
+
+def get_limiter(limiter, url: str):
+    """
+    Return the AdaptiveLimiter of the requests to url.
+
+    :param limiter: None or False to not limit requests, True to share a
+        limiter with the clients of the same host in this process, a str
+        with a sqlite file to share it with other processes too or an
+        :class:`AdaptiveLimiter` object.
+    :param url: URL of the request.
+    :return: :class:`AdaptiveLimiter` object or None
+    :rtype: AdaptiveLimiter
+    """
+
+    if not limiter or isinstance(limiter, AdaptiveLimiter):
+        return limiter or None
+
+    path = limiter if isinstance(limiter, str) else None
+    return AdaptiveLimiter.for_host(urlparse(url).netloc, path=path)
+
+
+class RateLimiter:
+
+    def __init__(self, rate: float = None):
+        """
+        Thread safe limiter of calls per second.
+
+        :param rate: (float) Max calls to acquire() by second. None or 0 to
+            not limit.
+
+        :return: :class:`RateLimiter` object
+        :rtype: RateLimiter
+        """
+
+        self.interval = 1.0 / rate if rate else 0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """ Block until a new call is allowed. """
+
+        if not self.interval:
+            return
+
+        # reserve the next free slot
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(self._next, now) + self.interval
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+class TTLCache:
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300, \
+            path: str = None, namespace: str = ''):
+        """
+        Thread safe LRU cache whose entries expire after ttl seconds. Keys
+        must be tuples with the container name in the second position, so the
+        entries of a container can be invalidated together.
+
+        :param maxsize: (int) Max entries. The least recently used is dropped.
+        :param ttl: (float) Seconds of life of each entry.
+        :param path: (str) Optional json file to load and save() the entries.
+            Keys and values must be json serializable.
+        :param namespace: (str) Section of the file of these entries, so
+            caches of different servers can share a file.
+
+        :return: :class:`TTLCache` object
+        :rtype: TTLCache
+        """
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.namespace = namespace
+
+        # key: (expires timestamp, value)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path:
+            self.load()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: tuple, default=None):
+        """ Return a copy of the value of key if exists and is alive. """
+
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            # expired entry
+            if item[0] < time.time():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+
+        # callers can modify the value safely
+        return copy.deepcopy(item[1])
+
+    def set(self, key: tuple, value):
+        """ Save a copy of value with key. """
+
+        with self._lock:
+            self._data[key] = (time.time() + self.ttl, copy.deepcopy(value))
+            self._data.move_to_end(key)
+
+            # drop least recently used
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, container: str = None):
+        """ Remove entries of a container, or all if container is None. """
+
+        with self._lock:
+            if container is None:
+                self._data.clear()
+                return
+
+            for key in [k for k in self._data if k[1] == container]:
+                del self._data[key]
+
+    @classmethod
+    def _as_key(cls, value):
+        """ Return value with the json lists as tuples, like cache keys. """
+
+        if isinstance(value, list):
+            return tuple(cls._as_key(v) for v in value)
+
+        return value
+
+    def _read(self):
+        """ Return the entries of all namespaces saved in self.path. """
+
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+        return data if isinstance(data, dict) else {}
+
+    def load(self):
+        """ Load alive entries of namespace from self.path if exists. """
+
+        now = time.time()
+        with self._lock:
+            for key, expires, value in self._read().get(self.namespace, []):
+                if expires >= now:
+                    self._data[self._as_key(key)] = (expires, value)
+
+    def save(self):
+        """ Save the entries of namespace in self.path. """
+
+        if not self.path:
+            return
+
+        with self._lock:
+            entries = [[key, item[0], item[1]] \
+                for key, item in self._data.items()]
+
+        # entries of other namespaces are kept
+        data = self._read()
+        data[self.namespace] = entries
+
+        # readable by the owner only
+        tmp_path = f'{self.path}.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.chmod(tmp_path, 0o600)
+        with os.fdopen(fd, 'w') as file:
+            json.dump(data, file)
+        os.replace(tmp_path, self.path)
+
+
+class SessionStore:
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: str = None):
+        """
+        Store of sessions -like the access_token and settings of nettime-
+        keyed by (url, username), to share a login between clients. Sessions
+        are kept in memory, and in a json file if path is received so clients
+        of other processes can share them too. The file is locked with lock().
+
+        :param path: (str) Optional json file to share sessions.
+
+        :return: :class:`SessionStore` object
+        :rtype: SessionStore
+        """
+
+        self.path = path
+        self._sessions = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """ Return the in memory store shared by the clients of process. """
+
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+
+        return cls._shared
+
+    def _read(self):
+        """ Return the sessions saved in self.path. """
+
+        try:
+            with open(self.path, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, sessions: dict):
+        """ Save sessions in self.path. """
+
+        # access tokens readable by the owner only
+        tmp_path = f'{self.path}.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.chmod(tmp_path, 0o600)
+        with os.fdopen(fd, 'w') as file:
+            json.dump(sessions, file)
+        os.replace(tmp_path, self.path)
+
+    @contextmanager
+    def lock(self, key: tuple):
+        """
+        Context manager to get, set or discard a session exclusively. Only
+        one client -of any process if self.path- holds the lock of a store.
+        """
+
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.RLock())
+
+        with key_lock:
+            if not self.path or fcntl is None:
+                yield
+                return
+
+            with open(f'{self.path}.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, key: tuple):
+        """ Return the session of key or None. Use it inside lock(). """
+
+        if self.path:
+            return self._read().get('|'.join(key))
+
+        return self._sessions.get(key)
+
+    def set(self, key: tuple, session: dict):
+        """ Save the session of key. Use it inside lock(). """
+
+        if self.path:
+            sessions = self._read()
+            sessions['|'.join(key)] = session
+            self._write(sessions)
+            return
+
+        self._sessions[key] = session
+
+    def discard(self, key: tuple, access_token: str):
+        """ Remove the session of key if it has access_token. """
+
+        session = self.get(key)
+        if not session or session.get("access_token") != access_token:
+            return
+
+        if self.path:
+            sessions = self._read()
+            sessions.pop('|'.join(key), None)
+            self._write(sessions)
+            return
+
+        self._sessions.pop(key, None)
+
+
+class Transport:
+
+    def __init__(self, headers: dict = None, auth: tuple = None, **kwargs):
+        """
+        Shared HTTP layer of the api clients. Requests use a pooled session
+        with precomputed headers, a retry and timeout policy and are reported
+        to the metrics hooks.
+
+        :param headers: (dict) Headers sent in all requests.
+        :param auth: (tuple) Basic authentication of all requests.
+        :param \*\*kwargs: Optional arguments:
+            'timeout': default timeout of requests. 20 seconds by default.
+            'retry': int or :class:`urllib3.util.Retry` with the retry policy
+            of the connections, or a RetryPolicy to retry the requests.
+            'hooks': list of callables like Metrics, called with method, url,
+            status, elapsed and error of each request.
+            'pool_connections', 'pool_maxsize' and 'keep_alive' of session.
+            See more information in the get_session() documentation.
+            'limiter': adaptive concurrency limit of requests per host. See
+            more information in the get_limiter() documentation.
+
+        :return: :class:`Transport` object
+        :rtype: Transport
+        """
+
+        self.timeout = kwargs.get("timeout", 20)
+        self.hooks = list(kwargs.get("hooks", None) or [])
+        self.limiter = kwargs.get("limiter", None)
+
+        # requests retried by the policy, connections by the adapter
+        retry = kwargs.get("retry", 0)
+        self.retry = retry if isinstance(retry, RetryPolicy) else None
+
+        self.session = get_session(
+            pool_connections=kwargs.get("pool_connections", 10),
+            pool_maxsize=kwargs.get("pool_maxsize", 10),
+            max_retries=0 if self.retry else retry,
+            keep_alive=kwargs.get("keep_alive", True),
+            headers=headers,
+            auth=auth,
+        )
+
+    def __enter__(self, *args, **kwargs):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        return self.close()
+
+    @property
+    def headers(self):
+        """ Headers sent in all requests. """
+
+        return self.session.headers
+
+    def close(self):
+        """ Close the pooled connections of the session. """
+
+        self.session.close()
+
+    def emit(self, method: str, url: str, status: int, elapsed: float, \
+            error: Exception = None):
+        """ Report a request to all hooks. """
+
+        for hook in self.hooks:
+            hook(method, url, status, elapsed, error)
+
+    def request(self, method: str, url: str, idempotent: bool = None, \
+            **kwargs):
+        """
+        Sends a request with the session and raise if it was an error.
+
+        :param method: Method for the new :class:`Request` object.
+        :param url: URL for the new :class:`Request` object.
+        :param idempotent: (bool) Override the idempotency rules of the
+            retry policy.
+        :param \*\*kwargs: Optional arguments that ``request`` takes. Timeout
+            is self.timeout if None.
+        :return: :class:`requests.Response` object
+        :rtype: requests.Response
+        """
+
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+
+        # body encoded with the json codec instead of requests
+        if kwargs.get("json") is not None and kwargs.get("data") is None:
+            kwargs["data"] = codec.dumps(kwargs.pop("json"))
+
+            headers = kwargs.get("headers") or {}
+            if "Content-Type" not in headers and \
+                    "Content-Type" not in self.session.headers:
+                kwargs["headers"] = {
+                    **headers, "Content-Type": "application/json"}
+
+        # wait a slot of the server if requests are limited
+        limiter = get_limiter(self.limiter, url)
+
+        def send():
+            if limiter:
+                return limiter.call(
+                    self.session.request, method, url, **kwargs)
+            return self.session.request(method, url, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            if self.retry:
+                response = self.retry.call(
+                    send, method, urlparse(url).path, idempotent=idempotent)
+            else:
+                response = send()
+        except requests.RequestException as error:
+            self.emit(method, url, None, time.perf_counter() - start, error)
+            raise
+
+        self.emit(method, url, response.status_code, \
+            time.perf_counter() - start)
+
+        # raise if was an error
+        if response.status_code not in range(200, 300):
+            raise ConnectionError(f'{response.status_code}: {response.text}')
+
+        return response
+
+    @staticmethod
+    def decode(response: requests.Response):
+        """ Return the json of response or an empty dict if it isn't json. """
+
+        try:
+            return codec.decode(response)
+        except ValueError:
+            return {}
+
+    def get(self, url: str, params: dict = None, stream: bool = False, \
+            **kwargs):
+        """
+        Sends a GET request with self.request().
+
+        :param url: URL for the new :class:`Request` object.
+        :param params: (optional) Dictionary, list of tuples or bytes to send
+            in the query string for the :class:`Request`.
+        :param stream: (bool) True to return the response without decode.
+        :param \*\*kwargs: Optional arguments that ``request`` takes.
+        :return: :class:`dict` object or response if stream
+        :rtype: dict
+        """
+
+        response = self.request(
+            'GET', url, params=params, stream=stream, **kwargs)
+
+        # if request is stream type, return all response
+        if stream:
+            return response
+
+        return self.decode(response)
+
+    def post(self, url: str, params: dict = None, data: dict = None, \
+            json: dict = None, **kwargs):
+        """
+        Sends a POST request with self.request().
+
+        :param url: URL for the new :class:`Request` object.
+        :param params: (optional) Dictionary to send in the query string.
+        :param data: (optional) Dictionary, list of tuples, bytes, or file-like
+            object to send in the body of the :class:`Request`.
+        :param json: (optional) json data to send in the body of the
+            :class:`Request`.
+        :param \*\*kwargs: Optional arguments that ``request`` takes.
+        :return: :class:`dict` object
+        :rtype: dict
+        """
+
+        response = self.request(
+            'POST', url, params=params, data=data, json=json, **kwargs)
+
+        return self.decode(response)
@@ -2,7 +2,7 @@
 #from random import choice as r_choice
 from urllib.parse import urlparse, urlencode, urljoin
 from base64 import b64encode, b64decode
-import requests
+from .transport import Transport, bounded_map
 import datetime
 import re
 import math
@@ -22,6 +22,9 @@ class Client:
             self.user_info = JsonObject(kwargs.get('user_info'))
             self.roles = [JsonObject(roles) for roles in kwargs.get('roles')]
 
+            # {filter keys: {filter values: tenant id}}
+            self._tenant_index = {}
+
         @property
         def ft_id(self):
             """ Return the id of the first available tenant. """
@@ -38,23 +41,24 @@ class Client:
             :return: :class:`int` object
             :rtype: int
             """
-            
-            # view all tenants
-            for _t in self.tenants:
-                
-                # matches to eval
-                _m = []
-
-                # eval all key: value parameters
-                for k, v in _filters.items():    
-                    _m.append(True if getattr(_t, k, None) == v else False)
-
-                # return tenant if all evals match
-                if all(_m):
-                    return getattr(_t, 'Id', None)
-            
-            # if None matche -or not all-
-            return None
+
+            # filter attributes in a fixed order
+            keys = tuple(sorted(_filters.keys()))
+
+            # index tenants by the filter attributes only the first time
+            index = self._tenant_index.get(keys)
+            if index is None:
+                index = {}
+                for _t in self.tenants:
+                    # first tenant that matches wins
+                    index.setdefault(
+                        tuple(getattr(_t, k, None) for k in keys),
+                        getattr(_t, 'Id', None)
+                    )
+                self._tenant_index[keys] = index
+
+            # None if no one matches -or not all-
+            return index.get(tuple(_filters.get(k) for k in keys))
     
     class Authentication:
         def __init__(self, **kwargs):
@@ -93,6 +97,15 @@ class Client:
         self.authentication = None
         self.account = None
 
+        # headers computed on demand, see headers property
+        self._headers = None
+
+        # dict to filter tenant
+        self._tenant_filter = kwargs.get('tenant_filter', None)
+
+        # pooled session shared by all requests, see Transport
+        self.transport = Transport(**kwargs)
+
         # connect client and set authentication object automatically
         self.connect()
 
@@ -103,8 +116,8 @@ class Client:
             roles=self.get(path='/Admin/account/roles')
         )
 
-        # dict to filter tenant
-        self.tenant_filter = kwargs.get('tenant_filter', None)
+        # tenant id is available now
+        self._headers = None
 
     def __str__(self):
         return '{}{} en {}'.format(
@@ -125,11 +138,30 @@ class Client:
         return self
 
     def __exit__(self, *args, **kwargs):
-        return self.disconnect()
+        self.disconnect()
+        return self.transport.close()
+
+    @property
+    def tenant_filter(self):
+        """ Dict used to get the tenant id of the requests. """
+
+        return self._tenant_filter
+
+    @tenant_filter.setter
+    def tenant_filter(self, value: dict):
+        # tenant id of headers must be resolved again
+        self._tenant_filter = value
+        self._headers = None
 
     @property
     def headers(self):
-        """ Get headers of the client with current data """
+        """
+        Get headers of the client with current data. Headers are computed once
+        per authentication and tenant filter.
+        """
+
+        if self._headers is not None:
+            return self._headers
 
         # empty headers initial
         data = {
@@ -156,6 +188,7 @@ class Client:
                     None
                 )
 
+        self._headers = data
         return data
     
     @property
@@ -192,32 +225,14 @@ class Client:
         if not self.is_connected and not kwargs.get('force', None):
             raise ConnectionError("Cliente desconectado. Utilice connect().")
 
-        # query prepare
-        query = {
-            "url": urljoin(self.client_url.geturl(), path),
-            "params": params,
-            "headers": self.headers,
-            "timeout": kwargs.get("timeout", 20),
-            "stream": kwargs.get("stream", False)
-        }
-
-        # consulting nettime
-        response = requests.get(**query)
-
-        # raise if was an error
-        if response.status_code not in range(200, 300):
-            raise ConnectionError(response.text)
-
-        # to json -> json
-        try:
-            # if request is stream type, return all response
-            if kwargs.get("stream"):
-                return response
-
-            # return json response
-            return response.json()
-        except:
-            return {}
+        # request.get -> json
+        return self.transport.get(
+            url=urljoin(self.client_url.geturl(), path),
+            params=params,
+            headers=self.headers,
+            timeout=kwargs.get("timeout", None),
+            stream=kwargs.get("stream", False)
+        )
 
     def post(self, path, data=None, json=None, **kwargs):
         """
@@ -241,27 +256,90 @@ class Client:
         if not self.is_connected and not kwargs.get('force', None):
             raise ConnectionError("Cliente desconectado. Utilice connect().")
 
-        # query prepare
-        query = {
-            "url": urljoin(self.client_url.geturl(), path),
-            "data": data,
-            "json": json,
-            "headers": self.headers,
-            "timeout": kwargs.get("timeout", 20),
-        }
+        # request.post -> json
+        return self.transport.post(
+            url=urljoin(self.client_url.geturl(), path),
+            data=data,
+            json=json,
+            headers=self.headers,
+            timeout=kwargs.get("timeout", None)
+        )
 
-        # consulting nettime
-        response = requests.post(**query)
+    def get_pages(self, path: str, params: dict, all_pages: bool = False, \
+            stream: bool = False, max_workers: int = 4, **kwargs):
+        """
+        Sends a GET request to a paged endpoint. If all_pages, the rest of the
+        pages are requested in parallel keeping the order of the values.
 
-        # raise if was an error
-        if response.status_code not in range(200, 300):
-            raise ConnectionError(response.text)
+        :param path: path to add to URL for the new :class:`Request` object.
+        :param params: Dictionary to send in the query string. Must contain
+            the 'pageSize' key.
+        :param all_pages: (bool) True to get values of all pages.
+        :param stream: (bool) True to return a generator of values instead of
+            the full response. Only used with all_pages.
+        :param max_workers: (int) Max pages requested at same time.
+        :return: :class:`dict` object or generator if stream
+        :rtype: dict
+        """
+
+        # request.get -> json
+        response = self.get(path=path, params=params)
+
+        if not all_pages:
+            return response
+
+        pages = self.iter_pages(
+            path=path,
+            params=params,
+            response=response,
+            max_workers=max_workers
+        )
+
+        # lazy values, only max_workers pages in memory
+        if stream:
+            return (value for values in pages for value in values)
+
+        # skip first page, it's the response itself
+        next(pages)
+        for values in pages:
+            response['values'].extend(values)
+
+        return response
+
+    def iter_pages(self, path: str, params: dict, response: dict = None, \
+            max_workers: int = 4):
+        """
+        Generator of the values of each page of a paged endpoint, in order.
+        Pages are requested in parallel by a bounded pool of threads.
+
+        :param path: path to add to URL for the new :class:`Request` object.
+        :param params: Dictionary to send in the query string. Must contain
+            the 'pageSize' key.
+        :param response: (optional) Response of the first page if was
+            requested yet.
+        :param max_workers: (int) Max pages requested at same time.
+        :return: generator of list
+        :rtype: generator
+        """
+
+        if response is None:
+            response = self.get(path=path, params=params)
+
+        yield response.get('values', [])
+
+        # calculate num of pages
+        page_size = params.get('pageSize') or len(response.get('values', []))
+        if not page_size:
+            return
+        num_pages = math.ceil(response.get('totalCount', 0) / page_size)
+
+        def get_page(page: int):
+            _params = dict(params, page=page)
+            return self.get(path=path, params=_params).get('values', [])
 
-        # to json -> json
-        try:
-            return response.json()
-        except:
-            return {}
+        # sliding window of requested pages
+        yield from bounded_map(
+            get_page, range(2, num_pages + 1), max_workers=max_workers)
 
     def connect(self):
         """ Connect the client to get access_token and headers values. """
@@ -284,6 +362,7 @@ class Client:
 
         # if everything ok
         self.authentication = self.Authentication(**response)
+        self._headers = None
 
     def disconnect(self):
         """ Disconnect the client if is connected. """
@@ -294,12 +373,14 @@ class Client:
 
         response = self.post(path='/Admin/authentication/logout')
         self.authentication = None
+        self._headers = None
 
     def reconnect(self):
         """ Reconnect client cleaning headers and access_token. """
 
-        # clean token for safety
+        # clean token and headers for safety
         self.authentication = None
+        self._headers = None
         self.connect()
 
     def get_employees(self, employee: str = None, extension: str = None, \
@@ -324,6 +405,7 @@ class Client:
                 only those records which have been modified since that date are 
                 considered. If no Date is provided (or None), all records will 
                 be returned.
+            'stream', 'max_workers': See get_pages() documentation.
         
         :return: :class:`dict` object
         :rtype: json
@@ -345,23 +427,12 @@ class Client:
         }
 
         # request.get -> json
-        response = self.get(path=path, params=params)
-        
-        # recursive call to get all pages values
-        if all_pages and response.get('totalCount', 0) > params.get('pageSize'):
-            # calculate num of pages
-            num_pages = math.ceil(
-                response.get('totalCount') / params.get('pageSize')
-            )
-            # recursive get and extend response values
-            for i in range(2, num_pages + 1):
-                # update page
-                params['page'] = i
-                response['values'].extend(
-                    self.get(path=path, params=params).get('values')
-                )
-        # return elements
-        return response
+        return self.get_pages(
+            path=path,
+            params=params,
+            all_pages=all_pages,
+            **kwargs
+        )
 
     def get_addresses(self, address: str = None, extension: str = None, \
             **kwargs):
@@ -384,7 +455,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_birth_places(self, **kwargs):
         
@@ -401,7 +472,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_countries(self, **kwargs):
 
@@ -417,7 +488,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_family_members(self, **kwargs):
 
@@ -432,7 +503,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_journals(self, journal: str = None, extension: str = "lines", \
             **kwargs):
@@ -460,13 +531,13 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_leaves(self, extension: str = None, **kwargs):
 
         # path prepare
         path = '/WebApi/leaves{}'.format(
-            f'/{extension}' if journal and extension else '',
+            f'/{extension}' if extension else '',
         )
 
         # getting default date
@@ -490,7 +561,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_loans(self, **kwargs):
 
@@ -511,7 +582,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_nationalities(self, **kwargs):
 
@@ -527,7 +598,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_pay_elements(self, employeeExternalId: str, **kwargs):
 
@@ -547,7 +618,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def post_pay_elements(self, values: list, **kwargs):
         """
@@ -617,7 +688,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_payrolls(self, extension: str, **kwargs):
 
@@ -647,7 +718,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_phases(self, phase: str = None, **kwargs):
 
@@ -667,7 +738,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_phones(self, phone: str = None, extension: str = None, **kwargs):
 
@@ -689,7 +760,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_scales(self, scale: int, **kwargs):
 
@@ -707,7 +778,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_seizures(self, startDate: str, **kwargs):
 
@@ -725,7 +796,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_structures(self, extension: str = None, **kwargs):
 
@@ -745,7 +816,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def get_sync(self, extension: str = None, applicationName: str = None, \
             **kwargs):
@@ -769,7 +840,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
     
     def post_sync(self, **kwargs):
         pass
@@ -806,7 +877,7 @@ class Client:
         }
 
         # request.get -> json
-        return self.get(path=path, params=params)
+        return self.get_pages(path=path, params=params, **kwargs)
 
     def post_time_management(self, **kwargs):
         pass
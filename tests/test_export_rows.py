@@ -0,0 +1,77 @@
+import io
+import json
+
+import pytest
+
+from spec_utils.nettime6 import iter_json_rows, iter_export_rows
+
+
+ROWS = [
+    {"id": 1, "name": "Lucyk, Lucas", "value": 10.25},
+    {"id": 2, "name": "Doe, John", "value": -3e-05, "tags": ["a", "b"]},
+    {"id": 3, "name": "]", "value": None},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 11, 65536])
+def test_json_array(chunk_size):
+    file = io.StringIO(json.dumps(ROWS, indent=2))
+    assert list(iter_json_rows(file, chunk_size=chunk_size)) == ROWS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 11, 65536])
+def test_json_lines(chunk_size):
+    file = io.StringIO("\n".join(json.dumps(row) for row in ROWS) + "\n")
+    rows = iter_json_rows(file, chunk_size=chunk_size, lines=True)
+    assert list(rows) == ROWS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 65536])
+def test_json_lines_of_arrays(chunk_size):
+    file = io.StringIO('[1,"a"]\n[2,"b"]\n[3,"c"]\n')
+    rows = iter_json_rows(file, chunk_size=chunk_size, lines=True)
+    assert list(rows) == [[1, "a"], [2, "b"], [3, "c"]]
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 12))
+def test_numbers_split_by_chunk(chunk_size):
+    values = [10.25, 1234567, -0.5, 1e10, 3]
+    file = io.StringIO(json.dumps(values))
+    assert list(iter_json_rows(file, chunk_size=chunk_size)) == values
+
+
+def test_empty_array():
+    assert list(iter_json_rows(io.StringIO("[ ]"))) == []
+
+
+def test_truncated_array_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_rows(io.StringIO('[{"id": 1}, {"id": 2'), 4))
+
+
+def test_export_rows_jsonl_of_arrays(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    path.write_text('[1,"a"]\n[2,"b"]\n[3,"c"]\n')
+
+    rows = list(iter_export_rows(str(path), fmt='jsonl'))
+    assert rows == [[1, "a"], [2, "b"], [3, "c"]]
+
+
+def test_export_rows_json(tmp_path):
+    path = tmp_path / "rows.json"
+    path.write_text(json.dumps(ROWS))
+
+    assert list(iter_export_rows(str(path), chunk_size=4)) == ROWS
+
+
+def test_export_rows_csv(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_text("a;b\n1;2\n3;4\n")
+
+    rows = list(iter_export_rows(str(path)))
+    assert rows == [{"a": "1", "b": "2"}, {"a": "3", "b": "4"}]
+
+
+def test_export_rows_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        next(iter_export_rows(str(tmp_path / "rows.xml")))